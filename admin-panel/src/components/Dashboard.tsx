@@ -35,6 +35,7 @@ import { Badge } from "@/components/ui/badge"
 import { useToast } from "@/hooks/use-toast"
 
 import type {
+  DashboardBundle,
   DashboardSummary,
   RevenuePoint,
   TopProduct,
@@ -70,39 +71,20 @@ const loadDashboard = async () => {
   try {
     setLoading(true)
 
-    const [
-      summaryRes,
-      revenueRes,
-      topRes,
-      categoryRes,
-    ] = await Promise.all([
-      adminFetch(
-        `/admin/dashboard/summary?period=${period}`
-      ),
-      adminFetch(
-        `/admin/dashboard/revenue?period=${period}`
-      ),
-      adminFetch(
-        "/admin/dashboard/top-products"
-      ),
-      adminFetch(
-        "/admin/dashboard/categories"
-      ),
-    ])
+    // one round trip — the backend runs the four sections concurrently
+    const res = await adminFetch(
+      `/admin/dashboard/bundle?period=${period}`
+    )
 
-    if (
-      !summaryRes.ok ||
-      !revenueRes.ok ||
-      !topRes.ok ||
-      !categoryRes.ok
-    ) {
+    if (!res.ok) {
       throw new Error("Failed to load dashboard data")
     }
 
-    setSummary(await summaryRes.json())
-    setRevenue(await revenueRes.json())
-    setTopProducts(await topRes.json())
-    setCategories(await categoryRes.json())
+    const bundle: DashboardBundle = await res.json()
+    setSummary(bundle.summary)
+    setRevenue(bundle.revenue)
+    setTopProducts(bundle.top_products)
+    setCategories(bundle.categories)
 
   } catch (error) {
     console.error("Dashboard load error:", error)
@@ -39,6 +39,7 @@ export function AddProductModal({ isOpen, onClose, onSuccess }: AddProductModalP
     shelf_life_days: 30,
     lead_time_days: 1,
     imagesrc: "",
+    image_variants: null as Record<string, unknown> | null,
     packing_01: "",
     price_01: "",
     packing_02: "",
@@ -59,6 +60,7 @@ export function AddProductModal({ isOpen, onClose, onSuccess }: AddProductModalP
       shelf_life_days: 30,
       lead_time_days: 1,
       imagesrc: "",
+      image_variants: null,
       packing_01: "",
       price_01: "",
       packing_02: "",
@@ -82,6 +84,7 @@ export function AddProductModal({ isOpen, onClose, onSuccess }: AddProductModalP
         shelf_life_days: formData.shelf_life_days,
         lead_time_days: formData.lead_time_days,
         imagesrc: formData.imagesrc,
+        image_variants: formData.image_variants,
         packing_01: formData.packing_01 || null, // send string or null
         price_01: formData.price_01 ? Number.parseFloat(formData.price_01) : null,
         packing_02: formData.packing_02 || null,
@@ -256,6 +259,7 @@ export function AddProductModal({ isOpen, onClose, onSuccess }: AddProductModalP
                           setFormData((prev) => ({
                             ...prev,
                             imagesrc: data.image_url,
+                            image_variants: data.image_variants ?? null,
                           }))
 
                           toast({
@@ -282,7 +286,7 @@ export function AddProductModal({ isOpen, onClose, onSuccess }: AddProductModalP
                   <Input
                     id="imagesrc"
                     value={formData.imagesrc}
-                    onChange={(e) => setFormData({ ...formData, imagesrc: e.target.value })}
+                    onChange={(e) => setFormData({ ...formData, imagesrc: e.target.value, image_variants: null })}
                     placeholder="https://example.com/image.jpg"
                     className="bg-white/90 backdrop-blur-sm border-slate-300"
                   />
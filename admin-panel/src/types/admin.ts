@@ -28,3 +28,12 @@ export interface CategoryData {
   name: string
   value: number
 }
+
+export interface DashboardBundle {
+  period: "weekly" | "monthly" | "yearly"
+  summary: DashboardSummary
+  revenue: RevenuePoint[]
+  top_products: TopProduct[]
+  categories: CategoryData[]
+  timings_ms: Record<string, number>
+}
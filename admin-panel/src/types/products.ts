@@ -4,6 +4,12 @@ export interface Product {
   category: string
   description?: string
   image_url?: string
+  images?: {
+    src?: string
+    srcset_webp?: string
+    srcset_jpeg?: string
+    [size: string]: unknown
+  }
   shelf_life_days?: number
   lead_time_days?: number
   variants: Array<{
@@ -0,0 +1,168 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # optional — gzip only without it
+    brotli = None
+
+# ------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------
+STATIC_DIR = "static"
+DIST_DIR = "dist"  # relative to STATIC_DIR
+MANIFEST_NAME = "manifest.json"
+ASSET_EXTENSIONS = (".css", ".js", ".svg")
+
+HASHED_NAME = re.compile(r"\.[0-9a-f]{10}\.[a-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+# ------------------------------------------------------
+# BUILD STEP:  python -m app.core.assets
+# ------------------------------------------------------
+def build_assets(static_dir: str = STATIC_DIR):
+    """
+    Copy css/js under static/ to static/dist/ with a content hash in the
+    name, write .gz / .br siblings and a manifest (logical -> hashed path).
+    """
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    shutil.rmtree(dist_dir, ignore_errors=True)
+
+    manifest = {}
+    for root, dirs, files in os.walk(static_dir):
+        if os.path.abspath(root).startswith(os.path.abspath(dist_dir)):
+            continue
+
+        for name in sorted(files):
+            if not name.endswith(ASSET_EXTENSIONS):
+                continue
+
+            src = os.path.join(root, name)
+            logical = os.path.relpath(src, static_dir).replace(os.sep, "/")
+
+            with open(src, "rb") as f:
+                data = f.read()
+
+            digest = hashlib.sha256(data).hexdigest()[:10]
+            stem, ext = os.path.splitext(logical)
+            hashed = f"{stem}.{digest}{ext}"
+
+            out = os.path.join(dist_dir, hashed)
+            os.makedirs(os.path.dirname(out), exist_ok=True)
+
+            with open(out, "wb") as f:
+                f.write(data)
+            with open(out + ".gz", "wb") as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(out + ".br", "wb") as f:
+                    f.write(brotli.compress(data, quality=11))
+
+            manifest[logical] = f"{DIST_DIR}/{hashed}"
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
+
+
+# ------------------------------------------------------
+# TEMPLATE HELPER
+# ------------------------------------------------------
+_manifest = None
+
+
+def load_manifest(static_dir: str = STATIC_DIR):
+    global _manifest
+    try:
+        with open(os.path.join(static_dir, DIST_DIR, MANIFEST_NAME)) as f:
+            _manifest = json.load(f)
+    except (OSError, ValueError):
+        _manifest = {}
+    return _manifest
+
+
+def asset_url(path: str) -> str:
+    """
+    {{ asset_url('css/product.css') }} -> /static/dist/css/product.<hash>.css
+    Falls back to the plain /static/ URL when assets were not built.
+    """
+    if _manifest is None:
+        load_manifest()
+    path = path.lstrip("/")
+    return "/static/" + _manifest.get(path, path)
+
+
+# ------------------------------------------------------
+# STATIC HANDLER
+# ------------------------------------------------------
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves a .br / .gz sibling when the client accepts it,
+    and marks content-hashed file names as immutable.
+    """
+
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+    def _accepted(self, scope):
+        accept = Headers(scope=scope).get("accept-encoding", "")
+        accepted = {
+            part.split(";")[0].strip()
+            for part in accept.split(",")
+            if not part.strip().endswith(";q=0")
+        }
+        return [(enc, suffix) for enc, suffix in self.ENCODINGS if enc in accepted]
+
+    async def get_response(self, path: str, scope):
+        if scope["method"] in ("GET", "HEAD"):
+            for encoding, suffix in self._accepted(scope):
+                full_path, stat_result = self.lookup_path(path + suffix)
+                if stat_result is None:
+                    continue
+
+                media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                response = FileResponse(
+                    full_path,
+                    stat_result=stat_result,
+                    media_type=media_type,
+                    headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+                )
+                if self.is_not_modified(response.headers, Headers(scope=scope)):
+                    response = self._not_modified(response)
+                self._cache_headers(path, response)
+                return response
+
+        response = await super().get_response(path, scope)
+        self._cache_headers(path, response)
+        return response
+
+    @staticmethod
+    def _not_modified(response):
+        return Response(status_code=304, headers={
+            k: v for k, v in response.headers.items()
+            if k in ("etag", "cache-control", "vary", "content-encoding", "last-modified")
+        })
+
+    @staticmethod
+    def _cache_headers(path: str, response):
+        if response.status_code not in (200, 304):
+            return
+        response.headers["Vary"] = "Accept-Encoding"
+        if HASHED_NAME.search(path):
+            response.headers["Cache-Control"] = IMMUTABLE
+
+
+if __name__ == "__main__":
+    built = build_assets()
+    print(f"Built {len(built)} assets into {STATIC_DIR}/{DIST_DIR}"
+          f" (brotli: {'yes' if brotli else 'no'})")
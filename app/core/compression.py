@@ -0,0 +1,230 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+# ------------------------------------------------------
+# COMPRESSORS
+# ------------------------------------------------------
+# Same three-call interface for every codec:
+#   compress(chunk) -> bytes, flush() -> bytes (for streaming), finish() -> bytes
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._c = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._c = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+def available_encodings():
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+# ------------------------------------------------------
+# MIDDLEWARE
+# ------------------------------------------------------
+DEFAULT_EXCLUDED_TYPES = (
+    "text/event-stream",
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/octet-stream",
+)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with zstd / br / gzip (server preference order,
+    limited to what the client accepts and what is installed).
+
+    - bodies smaller than `minimum_size` are sent as-is
+    - excluded content types (SSE, images, archives...) are never touched
+    - responses that already carry Content-Encoding pass through
+    - streaming responses are compressed chunk by chunk and flushed
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        encodings=None,
+        excluded_types=DEFAULT_EXCLUDED_TYPES,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        supported = available_encodings()
+        self.encodings = [e for e in (encodings or supported) if e in supported]
+        self.excluded_types = tuple(excluded_types)
+        self.levels = {"gzip": gzip_level, "br": brotli_quality, "zstd": zstd_level}
+
+    def choose_encoding(self, accept_encoding: str):
+        accepted = {}
+        for part in accept_encoding.lower().split(","):
+            name, _, params = part.strip().partition(";")
+            q = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    q = float(params.strip()[2:])
+                except ValueError:
+                    q = 0.0
+            accepted[name.strip()] = q
+
+        for encoding in self.encodings:
+            if accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding
+        return None
+
+    def compressor(self, encoding: str):
+        level = self.levels[encoding]
+        if encoding == "zstd":
+            return _Zstd(level)
+        if encoding == "br":
+            return _Brotli(level)
+        return _Gzip(level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message = None
+        self.passthrough = False
+        self.compressor = None
+
+    def _skip(self, headers: Headers) -> bool:
+        content_type = headers.get("content-type", "")
+        return (
+            "content-encoding" in headers
+            or "no-transform" in headers.get("cache-control", "")
+            or content_type.startswith(self.middleware.excluded_types)
+        )
+
+    def _start_compressed(self, content_length=None):
+        headers = MutableHeaders(scope=self.start_message)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            self.passthrough = self._skip(Headers(raw=message["headers"]))
+            if self.passthrough:
+                await self._send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        # ---- first body chunk decides ----
+        if self.start_message is not None:
+            if not more_body:
+                if len(body) < self.middleware.minimum_size:
+                    await self._send(self.start_message)
+                    await self._send(message)
+                else:
+                    c = self.middleware.compressor(self.encoding)
+                    compressed = c.compress(body) + c.finish()
+                    self._start_compressed(len(compressed))
+                    await self._send(self.start_message)
+                    await self._send({"type": "http.response.body", "body": compressed})
+                self.start_message = None
+                return
+
+            # streaming body — compress incrementally
+            self.compressor = self.middleware.compressor(self.encoding)
+            self._start_compressed()
+            await self._send(self.start_message)
+            self.start_message = None
+
+        if self.compressor is None:
+            await self._send(message)
+            return
+
+        chunk = self.compressor.compress(body)
+        if more_body:
+            chunk += self.compressor.flush()
+        else:
+            chunk += self.compressor.finish()
+
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,79 @@
+import hashlib
+import os
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from app.core.assets import asset_url
+from app.core.config import get_settings
+
+# ------------------------------------------------------
+# SHARED JINJA ENVIRONMENT
+# ------------------------------------------------------
+TEMPLATE_DIR = "templates"
+BYTECODE_CACHE_DIR = get_settings().jinja_bytecode_cache
+
+os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(["html", "xml"]),
+    bytecode_cache=FileSystemBytecodeCache(BYTECODE_CACHE_DIR),
+    auto_reload=get_settings().jinja_auto_reload,
+)
+
+env.globals["asset_url"] = asset_url
+
+# one instance for every router (main, auth, products, cart)
+templates = Jinja2Templates(env=env)
+
+
+# ------------------------------------------------------
+# PRE-RENDERED STATIC PAGES
+# ------------------------------------------------------
+# These pages depend only on the logged-in flag, so both variants are
+# rendered once at startup and served from memory with a strong ETag.
+STATIC_PAGES = [
+    "products.html",
+    "product-details.html",
+    "termscondition.html",
+]
+
+_rendered = {}
+
+
+def prerender_static_pages():
+    _rendered.clear()
+    for name in STATIC_PAGES:
+        template = env.get_template(name)
+        for is_logged_in in (False, True):
+            body = template.render(is_logged_in=is_logged_in).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            _rendered[(name, is_logged_in)] = (body, etag)
+
+
+def static_page(request: Request, name: str) -> Response:
+    is_logged_in = request.cookies.get("logged_in") == "true"
+    cached = _rendered.get((name, is_logged_in))
+
+    if cached is None:
+        # not pre-rendered (e.g. startup hook not run) — render normally
+        return templates.TemplateResponse(
+            request,
+            name,
+            {"is_logged_in": is_logged_in},
+        )
+
+    body, etag = cached
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Cookie",
+    }
+
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    return HTMLResponse(body, headers=headers)
@@ -0,0 +1,55 @@
+import os
+
+from sqlalchemy.engine import Engine
+
+# ------------------------------------------------------
+# SCHEMA VERSION CHECK
+# ------------------------------------------------------
+# Tables are owned by Alembic (see alembic.ini / migrations/). Workers no
+# longer create_all() at import — they refuse to start until the database
+# has been upgraded to the latest revision.
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ALEMBIC_INI = os.path.join(ROOT_DIR, "alembic.ini")
+
+
+def import_models():
+    """
+    Register every model on Base.metadata (autogenerate / env.py).
+    """
+    from app.models import address, admin, capacity, cart, orders, product, user  # noqa: F401
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(ROOT_DIR, "migrations"))
+    return config
+
+
+def head_revision():
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(engine: Engine):
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def check_schema(engine: Engine):
+    """
+    Raise RuntimeError unless the database is at the migration head.
+    """
+    current, head = current_revision(engine), head_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Database schema is at revision {current or '<unversioned>'}, expected {head}. "
+            "Run `alembic upgrade head` (existing databases created by create_all: "
+            "`alembic stamp 0001_baseline` first)."
+        )
+    print(f"✅ Database schema at {head}")
@@ -0,0 +1,36 @@
+from sqlalchemy.orm import Session
+
+# ------------------------------------------------------
+# INSERT ... ON DUPLICATE KEY UPDATE (MySQL) / ON CONFLICT (SQLite)
+# ------------------------------------------------------
+
+
+def upsert(db: Session, model, rows, key_columns, update_columns, increment=False):
+    """
+    Insert `rows` (list of dicts) in one executemany; on a key clash,
+    overwrite `update_columns` — or add to them with increment=True.
+    """
+    if not rows:
+        return
+
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table)
+        new = stmt.inserted
+        values = {c: (table.c[c] + new[c]) if increment else new[c] for c in update_columns}
+        stmt = stmt.on_duplicate_key_update(values)
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table)
+        new = stmt.excluded
+        values = {c: (table.c[c] + new[c]) if increment else new[c] for c in update_columns}
+        stmt = stmt.on_conflict_do_update(index_elements=list(key_columns), set_=values)
+    else:
+        raise RuntimeError(f"upsert not supported on {dialect}")
+
+    db.execute(stmt, rows)
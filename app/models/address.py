@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, UniqueConstraint
+from app.database.session import Base
+
+class UserAddress(Base):
+    __tablename__ = "user_addresses"
+    __table_args__ = (
+        # duplicate check + "all addresses of a user" (leading user_id)
+        UniqueConstraint("user_id", "line1", "pincode", name="uq_user_addresses_user_line1_pincode"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    line1 = Column(String(255), nullable=False)
+    line2 = Column(String(255), nullable=True)
+    city = Column(String(100), nullable=False)
+    state = Column(String(100), nullable=False)
+    pincode = Column(String(10), nullable=False)
+    type = Column(String(20), default="home")
+
+    created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String
+from app.database.session import Base
+
+class Admin(Base):
+    __tablename__ = "admins_ops"
+
+    id = Column(Integer, primary_key=True, index=True)
+    email = Column(String(255), unique=True, nullable=False)
+    password = Column(String(255), nullable=False)
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, Date
+from app.database.session import Base
+
+class DeliveryCapacity(Base):
+    __tablename__ = "delivery_capacity"
+
+    # kitchen load already booked per delivery date (paid, not cancelled)
+    delivery_date = Column(Date, primary_key=True)
+    booked_grams = Column(Integer, nullable=False, default=0)
+    booked_pieces = Column(Integer, nullable=False, default=0)
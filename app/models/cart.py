@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, JSON
+from app.database.session import Base
+
+class Cart(Base):
+    __tablename__ = "carts"
+
+    # one cart per customer — written behind by app.services.carts
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    items = Column(JSON, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
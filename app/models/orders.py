@@ -1,18 +1,24 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, JSON, func, Date
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, JSON, func, Date, Index
 from sqlalchemy.orm import relationship
 from app.database.session import Base
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # customer order history: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        # admin listings / dashboard: WHERE order_status IN (...) [AND created_at ...]
+        Index("ix_orders_order_status_created_at", "order_status", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
-    first_name = Column(String(100), nullable=True)
-    mobile_number = Column(String(20), nullable=True)
+    first_name = Column(String(100), nullable=True, index=True)  # admin name search
+    mobile_number = Column(String(20), nullable=True, index=True)  # admin phone-prefix filter
 
-    delivery_date = Column(Date, nullable=True)
+    delivery_date = Column(Date, nullable=True, index=True)
 
     address = Column(JSON, nullable=False)
     items = Column(JSON, nullable=False)
@@ -26,7 +32,43 @@ class Order(Base):
     razorpay_order_id = Column(String(50), unique=True, index=True)
     razorpay_payment_id = Column(String(50), nullable=True)
 
-    created_at = Column(DateTime, server_default=func.now())
+    # ✅ repeated checkouts of the same cart reuse the pending order
+    idempotency_key = Column(String(64), nullable=True, index=True)
+
+    created_at = Column(DateTime, server_default=func.now(), index=True)
     updated_at = Column(DateTime, nullable=True)
 
     user = relationship("User", back_populates="orders")
+
+
+class OrderArchive(Base):
+    """
+    Cold copy of finished orders, moved out of `orders` by
+    app.services.archive. Same columns; on MySQL the table is RANGE
+    partitioned by month on created_at, which therefore is part of the key.
+    """
+    __tablename__ = "orders_archive"
+    __table_args__ = (
+        Index("ix_orders_archive_user_id_created_at", "user_id", "created_at"),
+        Index("ix_orders_archive_order_status_created_at", "order_status", "created_at"),
+        Index("ix_orders_archive_mobile_number", "mobile_number"),
+        Index("ix_orders_archive_first_name", "first_name"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    created_at = Column(DateTime, primary_key=True)
+
+    user_id = Column(Integer, nullable=False)
+    first_name = Column(String(100), nullable=True)
+    mobile_number = Column(String(20), nullable=True)
+    delivery_date = Column(Date, nullable=True)
+    address = Column(JSON, nullable=False)
+    items = Column(JSON, nullable=False)
+    total_amount = Column(Float, nullable=False)
+    order_status = Column(String(20))
+    razorpay_order_id = Column(String(50), index=True)
+    razorpay_payment_id = Column(String(50), nullable=True)
+    idempotency_key = Column(String(64), nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+
+    archived_at = Column(DateTime, server_default=func.now())
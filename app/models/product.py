@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean
+from sqlalchemy import Column, Integer, String, Float, Boolean, JSON, Index
 from app.database.session import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # storefront listing: WHERE is_enabled = 1 [AND category = ?]
+        Index("ix_products_is_enabled_category", "is_enabled", "category"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     item_name = Column(String(100), nullable=False)
@@ -19,6 +23,8 @@ class Product(Base):
     price_04 = Column(Float, nullable=True)
     description = Column(String(255), nullable=True)
     imagesrc = Column(String(255), nullable=True)
+    # resized derivatives: {"thumbnail": {"width", "height", "webp", "jpeg"}, ...}
+    image_variants = Column(JSON, nullable=True)
     
     # ✅ Add this field
     is_enabled = Column(Boolean, default=True)
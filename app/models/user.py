@@ -11,6 +11,7 @@ class User(Base):
     email = Column(String(100), unique=True, index=True)
     mobile_number = Column(String(15), unique=True, index=True)
     password = Column(String(255))
+    # ⚠️ legacy — copied into user_addresses by migration 0003, no longer written
     address = Column(JSON, default=list)
     security_questions = Column(JSON, nullable=True)
     customer_id = Column(String(20), unique=True, index=True)
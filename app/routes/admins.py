@@ -1,26 +1,46 @@
 import json
+import time
 import traceback
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Literal
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from fastapi import (
     APIRouter,
     HTTPException,
     Depends,
     Query,
+    Request,
     Body,
+    File,
+    UploadFile,
 )
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, update, insert, select
 
-from app.database.session import get_db
+from app.core.config import get_settings
+from app.database.session import get_db, get_read_db, read_session_factory, SessionLocal
 from app.routes.admins_ops import get_current_admin, Admin
 from app.models.product import Product
-from app.models.orders import Order
+from app.models.orders import Order, OrderArchive
+from app.models.user import User
 from app.models.kitchenPrep import KitchenVariant, KitchenPrepItem
-from app.schemas.orders import OrderStatusUpdate
-from app.schemas.product import ProductsCreate  # ✅ ensure correct import
+from app.schemas.orders import OrderStatusUpdate, BulkOrderStatusUpdate, AdminOrderRow
+from app.schemas.product import ProductsCreate, ProductImportRow, ProductBulkToggle  # ✅ ensure correct import
+from app.services.cache import TTLCache
+from app.services.catalog import catalog_changed
+from app.services.categories import get_category_index
+from app.services.images import image_set
+from app.services.streaming import iter_csv, iter_ndjson, read_upload_rows, detect_format
+from app.services.archive import ARCHIVED_STATUSES, find_archived, needs_archive, newest_first, order_rows
+from app.services.audit import record_order_status_batch
+from app.services.capacity import is_booked, order_status_changed, release_orders
+from app.services.phones import normalize_phone
+from app.services.scheduler import scheduler
+from app.services.units import convert_to_grams
 
 # ------------------------------------------------------
 # 🔐 LOCKED ADMIN ROUTER (ADMIN JWT REQUIRED)
@@ -34,15 +54,385 @@ router = APIRouter(
 # ------------------------------------------------------
 # ORDERS
 # ------------------------------------------------------
-@router.get("/orders")
-def get_orders(db: Session = Depends(get_db)):
-    return (
-        db.query(Order)
-        .order_by(Order.created_at.desc())
-        .limit(500)
+ADMIN_ORDER_COLUMNS = (
+    Order.id,
+    Order.razorpay_order_id,
+    Order.first_name,
+    Order.mobile_number,
+    Order.created_at,
+    Order.delivery_date,
+    Order.total_amount,
+    Order.order_status,
+    Order.items,
+    Order.address,
+)
+
+
+def admin_order_row(o):
+    items = json.loads(o.items) if isinstance(o.items, str) else (o.items or [])
+    address = json.loads(o.address) if isinstance(o.address, str) else (o.address or {})
+    return AdminOrderRow(
+        id=o.id,
+        razorpay_order_id=o.razorpay_order_id,
+        first_name=o.first_name,
+        mobile_number=o.mobile_number,
+        customer_name=o.first_name,
+        phone_number=o.mobile_number,
+        created_at=o.created_at,
+        delivery_date=o.delivery_date,
+        total_amount=float(o.total_amount or 0),
+        order_status=o.order_status,
+        items=[i for i in items if isinstance(i, dict)],
+        address=address if isinstance(address, dict) else {},
+    )
+
+
+@router.get("/orders", response_model=List[AdminOrderRow])
+def get_orders(
+    status: str | None = Query(None, description="Comma separated, e.g. placed,confirmed"),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    delivery_date: date | None = None,
+    phone: str | None = Query(None, description="Customer phone prefix"),
+    limit: int = Query(500, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Filters map onto indexes: (order_status, created_at), created_at,
+    delivery_date and mobile_number (prefix LIKE) — on both tables
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must be before date_to")
+
+    statuses = [s.strip() for s in status.split(",") if s.strip()] if status else []
+    phone = normalize_phone(phone)
+
+    def where(model):
+        criteria = []
+        if statuses:
+            criteria.append(model.order_status.in_(statuses))
+        if date_from:
+            criteria.append(model.created_at >= date_from)
+        if date_to:
+            criteria.append(model.created_at < date_to + timedelta(days=1))
+        if delivery_date:
+            criteria.append(model.delivery_date == delivery_date)
+        if phone:
+            criteria.append(model.mobile_number.startswith(phone, autoescape=True))
+        return criteria
+
+    # orders_archive is only read when the page / date range reaches it
+    rows = newest_first(
+        db,
+        [c.key for c in ADMIN_ORDER_COLUMNS],
+        where,
+        offset=offset,
+        limit=limit,
+        date_from=date_from,
+        statuses=statuses,
+    )
+    return [admin_order_row(o) for o in rows]
+
+
+# ------------------------------------------------------
+# ORDER SEARCH (admin on the phone with a customer)
+# ------------------------------------------------------
+MIN_PHONE_PREFIX = 3
+MIN_NAME_PREFIX = 2
+
+
+def _recent(query, model, limit):
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit).all()
+
+
+def _search_table(db: Session, model, q: str, limit: int):
+    columns = [getattr(model, c.key) for c in ADMIN_ORDER_COLUMNS]
+    rows = []
+
+    phone = normalize_phone(q)
+    if q.isdigit():
+        rows += db.query(*columns).filter(model.id == int(q)).all()
+    if len(phone) >= MIN_PHONE_PREFIX and not any(c.isalpha() for c in q):
+        rows += _recent(
+            db.query(*columns).filter(model.mobile_number.startswith(phone, autoescape=True)),
+            model,
+            limit,
+        )
+
+    if len(q) >= MIN_NAME_PREFIX and any(c.isalpha() for c in q):
+        rows += _recent(
+            db.query(*columns).filter(model.first_name.startswith(q, autoescape=True)),
+            model,
+            limit,
+        )
+
+    # customer ids are short uuid prefixes — may be all digits
+    if len(q) >= MIN_NAME_PREFIX:
+        user_ids = [
+            u for (u,) in db.query(User.id)
+            .filter(User.customer_id.startswith(q, autoescape=True))
+            .limit(limit)
+        ]
+        if user_ids:
+            rows += _recent(
+                db.query(*columns).filter(model.user_id.in_(user_ids)),
+                model,
+                limit,
+            )
+    return rows
+
+
+@router.get("/orders/search", response_model=List[AdminOrderRow])
+def search_orders(
+    q: str = Query(..., min_length=1, description="Order id, phone, customer name or customer id prefix"),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """
+    Each branch is an indexed lookup capped at `limit`:
+    id, mobile_number / first_name (prefix LIKE),
+    users.customer_id (prefix) -> (user_id, created_at).
+    Run on orders, and on orders_archive once it has rows; results are
+    merged newest first.
+    """
+    q = q.strip()
+    rows = _search_table(db, Order, q, limit)
+    if needs_archive(db):
+        rows += _search_table(db, OrderArchive, q, limit)
+
+    unique = {o.id: o for o in rows}.values()
+    newest = sorted(unique, key=lambda o: (o.created_at or datetime.min, o.id), reverse=True)
+    return [admin_order_row(o) for o in newest[:limit]]
+
+# ------------------------------------------------------
+# ORDER EXPORT (ACCOUNTING)
+# ------------------------------------------------------
+ORDER_EXPORT_FIELDS = [
+    "order_id",
+    "razorpay_order_id",
+    "created_at",
+    "delivery_date",
+    "order_status",
+    "first_name",
+    "mobile_number",
+    "total_amount",
+    "address_line1",
+    "address_line2",
+    "address_city",
+    "address_state",
+    "address_pincode",
+    "item_name",
+    "item_variant",
+    "item_quantity",
+    "item_price",
+    "item_total",
+]
+
+
+def _flatten_address(address):
+    address = json.loads(address) if isinstance(address, str) else (address or {})
+    return {
+        f"address_{k}": address.get(k)
+        for k in ("line1", "line2", "city", "state", "pincode")
+    }
+
+
+def _iter_export_orders(date_from, date_to, statuses, per_item: bool):
+    """
+    Stream orders over a server-side cursor (own session, constant memory).
+    per_item=True  -> one flat row per order item (CSV)
+    per_item=False -> one row per order with an items list (NDJSON)
+    """
+    db = SessionLocal()
+    try:
+        def where(model):
+            criteria = []
+            if date_from:
+                criteria.append(model.created_at >= date_from)
+            if date_to:
+                criteria.append(model.created_at < date_to + timedelta(days=1))
+            if statuses:
+                criteria.append(model.order_status.in_(statuses))
+            return criteria
+
+        rows = order_rows(
+            [
+                "id", "razorpay_order_id", "created_at", "delivery_date", "order_status",
+                "first_name", "mobile_number", "total_amount", "address", "items",
+            ],
+            where,
+            include_archive=needs_archive(db, date_from, statuses),
+        )
+        result = db.execute(
+            select(rows)
+            .order_by(rows.c.created_at, rows.c.id)
+            .execution_options(yield_per=1000)
+        )
+
+        for o in result:
+            base = {
+                "order_id": o.id,
+                "razorpay_order_id": o.razorpay_order_id,
+                "created_at": o.created_at.isoformat() if o.created_at else None,
+                "delivery_date": o.delivery_date.isoformat() if o.delivery_date else None,
+                "order_status": o.order_status,
+                "first_name": o.first_name,
+                "mobile_number": o.mobile_number,
+                "total_amount": float(o.total_amount or 0),
+                **_flatten_address(o.address),
+            }
+            items = json.loads(o.items) if isinstance(o.items, str) else (o.items or [])
+
+            if not per_item:
+                base["items"] = [
+                    {
+                        "name": i.get("name"),
+                        "variant": i.get("variant"),
+                        "quantity": int(i.get("quantity", 0)),
+                        "price": float(i.get("price", 0)),
+                    }
+                    for i in items
+                ]
+                yield base
+                continue
+
+            for i in items or [{}]:
+                quantity = int(i.get("quantity", 0))
+                price = float(i.get("price", 0))
+                yield {
+                    **base,
+                    "item_name": i.get("name"),
+                    "item_variant": i.get("variant"),
+                    "item_quantity": quantity,
+                    "item_price": price,
+                    "item_total": quantity * price,
+                }
+    finally:
+        db.close()
+
+
+@router.get("/orders/export")
+def export_orders(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    status: str | None = Query(None, description="Comma separated, e.g. delivered,completed"),
+    format: Literal["csv", "ndjson"] = "csv",
+):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must be before date_to")
+
+    statuses = [s.strip() for s in status.split(",") if s.strip()] if status else []
+
+    if format == "ndjson":
+        body = iter_ndjson(_iter_export_orders(date_from, date_to, statuses, per_item=False))
+        media_type = "application/x-ndjson"
+    else:
+        body = iter_csv(
+            _iter_export_orders(date_from, date_to, statuses, per_item=True),
+            ORDER_EXPORT_FIELDS,
+        )
+        media_type = "text/csv"
+
+    filename = f"orders_{date_from or 'all'}_{date_to or 'now'}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# ------------------------------------------------------
+# ORDER STATUS FLOW
+# ------------------------------------------------------
+ORDER_FLOW = ["placed", "confirmed", "inprocess", "dispatched", "delivered", "completed"]
+CANCELLABLE = {"placed", "confirmed", "inprocess"}
+
+
+def allowed_sources(target: str):
+    """
+    Statuses an order may be moved FROM to reach `target` in a bulk update.
+    Forward moves along ORDER_FLOW only; rejected/cancelled before dispatch.
+    """
+    if target in ORDER_FLOW:
+        return set(ORDER_FLOW[:ORDER_FLOW.index(target)])
+    if target in ("rejected", "cancelled"):
+        return set(CANCELLABLE)
+    return set()
+
+
+@router.patch("/orders/bulk-status")
+def bulk_update_order_status(
+    payload: BulkOrderStatusUpdate,
+    admin: Admin = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    target = payload.order_status
+    sources = allowed_sources(target)
+    if not sources:
+        raise HTTPException(status_code=400, detail=f"Unsupported status '{target}'")
+
+    order_ids = list(dict.fromkeys(payload.order_ids))
+    if not order_ids:
+        return {"order_status": target, "updated_count": 0, "results": []}
+    if len(order_ids) > 500:
+        raise HTTPException(status_code=400, detail="Max 500 orders per request")
+
+    # ✅ one locked SELECT for current state, one UPDATE for the batch
+    current = dict(
+        db.query(Order.id, Order.order_status)
+        .filter(Order.id.in_(order_ids))
+        .with_for_update()
         .all()
     )
 
+    results = []
+    eligible = []
+    for order_id in order_ids:
+        status = current.get(order_id)
+        if status is None:
+            results.append({"id": order_id, "result": "not_found"})
+        elif status == target:
+            results.append({"id": order_id, "result": "unchanged", "from": status})
+        elif status not in sources:
+            results.append({"id": order_id, "result": "invalid_transition", "from": status})
+        else:
+            eligible.append(order_id)
+            results.append({"id": order_id, "result": "updated", "from": status})
+
+    # ✅ cancelled / rejected orders give their kitchen capacity back
+    releasing = [i for i in eligible if is_booked(current[i]) and not is_booked(target)]
+    if releasing:
+        release_orders(
+            db,
+            db.query(Order.delivery_date, Order.items).filter(Order.id.in_(releasing)).all(),
+        )
+
+    if eligible:
+        db.execute(
+            update(Order)
+            .where(Order.id.in_(eligible), Order.order_status.in_(sources))
+            .values(order_status=target, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+    record_order_status_batch(
+        admin.email,
+        target,
+        [
+            {"id": r["id"], "from": r["from"], "to": target}
+            for r in results
+            if r["result"] == "updated"
+        ],
+    )
+
+    return {
+        "order_status": target,
+        "updated_count": len(eligible),
+        "results": results,
+    }
+
 
 @router.patch("/orders/{order_id}")
 def update_order_status(
@@ -50,10 +440,21 @@ def update_order_status(
     payload: OrderStatusUpdate,
     db: Session = Depends(get_db),
 ):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = db.query(Order).filter(Order.id == order_id).with_for_update().first()
     if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
+        # finished orders may have moved to orders_archive; they can only
+        # move between finished statuses there (reads of live statuses
+        # never look at the archive)
+        order = find_archived(db, order_id, for_update=True)
+        if not order:
+            raise HTTPException(status_code=404, detail="Order not found")
+        if payload.order_status not in ARCHIVED_STATUSES:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Order {order_id} is archived; it can only be set to a finished status",
+            )
 
+    order_status_changed(db, order, order.order_status, payload.order_status)
     order.order_status = payload.order_status
     db.commit()
     db.refresh(order)
@@ -63,53 +464,64 @@ def update_order_status(
 # ------------------------------------------------------
 # DASHBOARD SUMMARY
 # ------------------------------------------------------
-@router.get("/dashboard/summary")
-def dashboard_summary(
-    period: str = "monthly",
-    db: Session = Depends(get_db),
-):
-    now = datetime.utcnow()
+# several admins opening the dashboard at once share one computation per
+# endpoint + period (DASHBOARD_CACHE_TTL seconds, per worker)
+dashboard_cache = TTLCache(ttl_seconds=get_settings().dashboard_cache_ttl)
+
+PERIOD_DAYS = {"weekly": 7, "monthly": 30, "yearly": 365}
+
 
-    start_date = {
-        "weekly": now - timedelta(days=7),
-        "yearly": now - timedelta(days=365),
-    }.get(period, now - timedelta(days=30))
+def _summary(db: Session, period: str):
+    start_date = datetime.utcnow() - timedelta(days=PERIOD_DAYS.get(period, 30))
 
+    # ✅ one pass over the created_at range for all three numbers
+    # (+ orders_archive when the period reaches back into it)
+    rows = order_rows(
+        ["id", "total_amount", "mobile_number"],
+        lambda model: [model.created_at >= start_date],
+        include_archive=needs_archive(db, start_date),
+    )
+    row = db.query(
+        func.coalesce(func.sum(rows.c.total_amount), 0),
+        func.count(rows.c.id),
+        func.count(func.distinct(rows.c.mobile_number)),
+    ).one()
     return {
-        "total_revenue": float(
-            db.query(func.coalesce(func.sum(Order.total_amount), 0))
-            .filter(Order.created_at >= start_date)
-            .scalar()
-        ),
-        "total_orders": db.query(func.count(Order.id))
-        .filter(Order.created_at >= start_date)
-        .scalar(),
-        "total_customers": db.query(
-            func.count(func.distinct(Order.mobile_number))
-        )
-        .filter(Order.created_at >= start_date)
-        .scalar(),
+        "total_revenue": float(row[0]),
+        "total_orders": row[1],
+        "total_customers": row[2],
     }
 
 
+def cached_summary(db: Session, period: str):
+    period = period if period in PERIOD_DAYS else "monthly"
+    return dashboard_cache.get_or_compute(("summary", period), lambda: _summary(db, period))
+
+
+@router.get("/dashboard/summary")
+def dashboard_summary(
+    period: str = "monthly",
+    db: Session = Depends(get_read_db),
+):
+    return cached_summary(db, period)
+
+
 # ------------------------------------------------------
 # DASHBOARD REVENUE
 # ------------------------------------------------------
-@router.get("/dashboard/revenue")
-def dashboard_revenue(
-    period: str = "monthly",
-    db: Session = Depends(get_db),
-):
+def _revenue(db: Session, period: str):
+    # all-time series — includes archived orders
+    orders = order_rows(["created_at", "total_amount"], include_archive=needs_archive(db))
     label = (
-        func.date(Order.created_at)
+        func.date(orders.c.created_at)
         if period == "weekly"
-        else func.year(Order.created_at)
+        else func.year(orders.c.created_at)
         if period == "yearly"
-        else func.date_format(Order.created_at, "%Y-%m")
+        else func.date_format(orders.c.created_at, "%Y-%m")
     )
 
     rows = (
-        db.query(label.label("name"), func.sum(Order.total_amount))
+        db.query(label.label("name"), func.sum(orders.c.total_amount))
         .group_by("name")
         .order_by("name")
         .all()
@@ -118,12 +530,25 @@ def dashboard_revenue(
     return [{"name": str(r[0]), "revenue": float(r[1] or 0)} for r in rows]
 
 
+def cached_revenue(db: Session, period: str):
+    period = period if period in PERIOD_DAYS else "monthly"
+    return dashboard_cache.get_or_compute(("revenue", period), lambda: _revenue(db, period))
+
+
+@router.get("/dashboard/revenue")
+def dashboard_revenue(
+    period: str = "monthly",
+    db: Session = Depends(get_read_db),
+):
+    return cached_revenue(db, period)
+
+
 # ------------------------------------------------------
 # TOP PRODUCTS
 # ------------------------------------------------------
-@router.get("/dashboard/top-products")
-def top_products(db: Session = Depends(get_db)):
-    orders = db.query(Order.items).all()
+def _top_products(db: Session):
+    rows = order_rows(["items"], include_archive=needs_archive(db))
+    orders = db.execute(select(rows.c["items"])).all()
     product_map = {}
 
     for (items,) in orders:
@@ -150,9 +575,19 @@ def top_products(db: Session = Depends(get_db)):
     )[:5]
 
 
+def cached_top_products(db: Session):
+    return dashboard_cache.get_or_compute(("top-products",), lambda: _top_products(db))
+
+
+@router.get("/dashboard/top-products")
+def top_products(db: Session = Depends(get_read_db)):
+    return cached_top_products(db)
+
+
 # ------------------------------------------------------
 # PRODUCTS STATE
 # ------------------------------------------------------
+# primary on purpose: the admin panel re-reads this right after its own writes
 @router.get("/products-state")
 def get_all_products_with_status(db: Session = Depends(get_db)):
     products = db.query(Product).all()
@@ -172,6 +607,7 @@ def get_all_products_with_status(db: Session = Depends(get_db)):
             "category": p.category,
             "description": p.description,
             "image_url": p.imagesrc,
+            "images": image_set(p.imagesrc, p.image_variants),
             "variants": variants,
             "max_price": max((v["price"] for v in variants), default=0),
             "shelf_life_days": p.shelf_life_days,
@@ -193,6 +629,7 @@ def toggle_product_status(product_id: int, db: Session = Depends(get_db)):
 
     product.is_enabled = not product.is_enabled
     db.commit()
+    catalog_changed(product_id)
     return {"product_id": product.id, "new_status": product.is_enabled}
 
 
@@ -202,13 +639,33 @@ def toggle_all_products(
     db: Session = Depends(get_db),
 ):
     is_enable = action == "1"
-    products = db.query(Product).all()
 
-    for p in products:
-        p.is_enabled = is_enable
+    # ✅ set-based — no ORM objects loaded
+    affected = (
+        db.query(Product)
+        .update({Product.is_enabled: is_enable}, synchronize_session=False)
+    )
+    db.commit()
+    catalog_changed()
+    return {"affected_count": affected}
+
 
+@router.patch("/products/bulk-toggle")
+def bulk_toggle_products(
+    payload: ProductBulkToggle,
+    db: Session = Depends(get_db),
+):
+    if not payload.product_ids:
+        return {"affected_count": 0}
+
+    affected = (
+        db.query(Product)
+        .filter(Product.id.in_(payload.product_ids))
+        .update({Product.is_enabled: payload.is_enabled}, synchronize_session=False)
+    )
     db.commit()
-    return {"affected_count": len(products)}
+    catalog_changed()
+    return {"affected_count": affected}
 
 
 # ------------------------------------------------------
@@ -224,6 +681,7 @@ def add_product(
         db.add(new_product)
         db.commit()
         db.refresh(new_product)
+        catalog_changed(new_product.id)
         return {"message": "Product added", "product_id": new_product.id}
     except Exception:
         db.rollback()
@@ -241,11 +699,17 @@ def update_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
+    # a new image URL without new derivatives makes the old ones stale
+    if "imagesrc" in product_data and "image_variants" not in product_data:
+        if product_data["imagesrc"] != product.imagesrc:
+            product.image_variants = None
+
     for k, v in product_data.items():
         if hasattr(product, k):
             setattr(product, k, v)
 
     db.commit()
+    catalog_changed(product_id)
     return {"message": "Product updated"}
 
 
@@ -260,54 +724,215 @@ def delete_product(
 
     db.delete(product)
     db.commit()
+    catalog_changed(product_id)
     return {"message": "Product deleted"}
 
-@router.get("/dashboard/categories")
-def product_categories(db: Session = Depends(get_db)):
-    rows = (
-        db.query(Product.category, func.count(Product.id))
-        .group_by(Product.category)
-        .all()
+# ------------------------------------------------------
+# PRODUCT IMPORT / EXPORT (CSV + NDJSON)
+# ------------------------------------------------------
+PRODUCT_EXPORT_FIELDS = ["id", *ProductsCreate.model_fields.keys(), "is_enabled"]
+# nested JSON doesn't fit a CSV cell — NDJSON only
+PRODUCT_CSV_FIELDS = [f for f in PRODUCT_EXPORT_FIELDS if f != "image_variants"]
+IMPORT_BATCH_SIZE = 200
+MAX_IMPORT_ERRORS = 500
+
+
+def _iter_product_rows():
+    # own session: the response body is produced after the request scope ends
+    db = SessionLocal()
+    try:
+        columns = [getattr(Product, f) for f in PRODUCT_EXPORT_FIELDS]
+        result = db.execute(
+            select(*columns)
+            .order_by(Product.id)
+            .execution_options(yield_per=500)
+        )
+        for row in result.mappings():
+            yield dict(row)
+    finally:
+        db.close()
+
+
+@router.get("/products/export")
+def export_products(format: Literal["csv", "ndjson"] = "csv"):
+    if format == "ndjson":
+        body = iter_ndjson(_iter_product_rows())
+        media_type = "application/x-ndjson"
+    else:
+        body = iter_csv(_iter_product_rows(), PRODUCT_CSV_FIELDS)
+        media_type = "text/csv"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'},
     )
 
-    return [
-        {"name": category, "value": count}
-        for category, count in rows
-        if category
-    ]
 
-# ------------------------------------------------------
-# 🔧 VARIANT PARSER (WEIGHT + PCS)
-# ------------------------------------------------------
-def convert_to_grams(variant: str):
+def _flush_import_batch(db: Session, batch: list, name_to_id: dict):
     """
-    Returns:
-    (weight_in_grams, pieces)
+    Upsert one batch: rows with a known id are UPDATEd by primary key,
+    the rest are INSERTed — each as a single executemany.
     """
-    if not variant:
-        return 0, 0
+    updates = [r for r in batch if r.get("id")]
+    inserts = [r for r in batch if not r.get("id")]
+
+    if updates:
+        db.execute(update(Product), updates)
+    if inserts:
+        for r in inserts:
+            r.setdefault("is_enabled", True)
+        db.execute(insert(Product), inserts)
+    db.commit()
 
-    v = variant.lower().replace(" ", "")
-    import re
+    if inserts:
+        names = [r["item_name"] for r in inserts]
+        name_to_id.update(
+            db.query(Product.item_name, Product.id)
+            .filter(Product.item_name.in_(names))
+            .all()
+        )
+
+    return len(inserts), len(updates)
+
+
+@router.post("/products/import")
+def import_products(
+    file: UploadFile = File(...),
+    format: Literal["csv", "ndjson"] | None = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Bulk upsert products from CSV / NDJSON.
+    Rows match existing products by `id`, else by exact `item_name`.
+    """
+    fmt = detect_format(file.filename, format)
 
-    match = re.search(r"(\d+(?:\.\d+)?)", v)
-    if not match:
-        return 0, 0
+    # one projected query instead of a lookup per row
+    name_to_id = dict(db.query(Product.item_name, Product.id).all())
+    known_ids = set(name_to_id.values())
 
-    value = float(match.group(1))
+    batch = {}
+    errors = []
+    created = updated = 0
 
-    # WEIGHT
-    if "kg" in v:
-        return int(value * 1000), 0
-    if "gm" in v or "g" in v:
-        return int(value), 0
+    try:
+        for line_no, raw in read_upload_rows(file.file, fmt):
+            if isinstance(raw, Exception):
+                errors.append({"line": line_no, "error": str(raw)})
+                continue
 
-    # PIECES
-    if "pcs" in v or "ps" in v or "pc" in v:
-        return 0, int(value)
+            try:
+                row = ProductImportRow.model_validate(raw)
+            except ValidationError as e:
+                errors.append({
+                    "line": line_no,
+                    "error": "; ".join(
+                        f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                        for err in e.errors()
+                    ),
+                })
+                continue
 
-    return 0, 0
+            data = row.model_dump(exclude_unset=True)
+            product_id = data.get("id") or name_to_id.get(row.item_name)
 
+            if data.get("id") and data["id"] not in known_ids:
+                errors.append({"line": line_no, "error": f"Unknown product id {data['id']}"})
+                continue
+
+            if product_id:
+                data["id"] = product_id
+
+            # later rows for the same product win within a batch
+            batch[product_id or ("new", row.item_name)] = data
+
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                c, u = _flush_import_batch(db, list(batch.values()), name_to_id)
+                created += c
+                updated += u
+                batch = {}
+
+            if len(errors) >= MAX_IMPORT_ERRORS:
+                break
+
+        if batch:
+            c, u = _flush_import_batch(db, list(batch.values()), name_to_id)
+            created += c
+            updated += u
+
+    except UnicodeDecodeError:
+        db.rollback()
+        catalog_changed()
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    except Exception:
+        db.rollback()
+        catalog_changed()
+        print(traceback.format_exc())
+        raise HTTPException(status_code=500, detail="Product import failed")
+
+    catalog_changed()
+    return {
+        "created": created,
+        "updated": updated,
+        "failed": len(errors),
+        "errors": errors,
+    }
+
+
+@router.get("/dashboard/categories")
+def product_categories(db: Session = Depends(get_read_db)):
+    # ✅ precomputed with the catalog — no GROUP BY per dashboard load
+    return get_category_index(db).totals()
+
+
+# ------------------------------------------------------
+# DASHBOARD BUNDLE (one request for the whole dashboard)
+# ------------------------------------------------------
+# The four sections are independent, so they run concurrently, each on its
+# own session / pooled connection (a Session must not be shared between
+# threads). Cached sections return immediately.
+dashboard_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard")
+
+
+def _timed_section(session_factory, compute):
+    start = time.perf_counter()
+    with session_factory() as db:
+        value = compute(db)
+    return value, round((time.perf_counter() - start) * 1000, 2)
+
+
+@router.get("/dashboard/bundle")
+def dashboard_bundle(request: Request, period: str = "monthly"):
+    period = period if period in PERIOD_DAYS else "monthly"
+    session_factory = read_session_factory(request)
+
+    sections = {
+        "summary": lambda db: cached_summary(db, period),
+        "revenue": lambda db: cached_revenue(db, period),
+        "top_products": cached_top_products,
+        "categories": lambda db: get_category_index(db).totals(),
+    }
+
+    start = time.perf_counter()
+    futures = {
+        name: dashboard_pool.submit(_timed_section, session_factory, compute)
+        for name, compute in sections.items()
+    }
+
+    bundle = {"period": period, "timings_ms": {}}
+    for name, future in futures.items():
+        bundle[name], bundle["timings_ms"][name] = future.result()
+    bundle["timings_ms"]["total"] = round((time.perf_counter() - start) * 1000, 2)
+    return bundle
+
+# ------------------------------------------------------
+# BACKGROUND JOBS (metrics of this worker's scheduler)
+# ------------------------------------------------------
+@router.get("/jobs")
+def background_jobs():
+    # only the leader worker runs jobs — others report is_leader: false
+    return scheduler.metrics()
 
 # ------------------------------------------------------
 # 🔥 PRIORITY LOGIC
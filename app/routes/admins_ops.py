@@ -1,34 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, Form, Request, status
 from sqlalchemy.orm import Session
-from sqlalchemy import Column, Integer, String
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 import bcrypt
-import os
-from dotenv import load_dotenv
 
-from app.database.session import get_db, Base, engine
+from app.core.config import get_settings
+from app.database.session import get_db
+from app.models.admin import Admin
 
 # -------------------------------------------------
 # ENV
 # -------------------------------------------------
-load_dotenv()
-
-SECRET_KEY = os.getenv("SECRET_KEY", "super-secret-key")
-ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
-ADMIN_TOKEN_EXPIRE_MINUTES = int(os.getenv("ADMIN_TOKEN_EXPIRE_MINUTES", 720))
-
-# -------------------------------------------------
-# Admin Model
-# -------------------------------------------------
-class Admin(Base):
-    __tablename__ = "admins_ops"
-
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String(255), unique=True, nullable=False)
-    password = Column(String(255), nullable=False)
-
-Base.metadata.create_all(bind=engine)
+settings = get_settings()
+SECRET_KEY = settings.admin_secret_key
+ALGORITHM = settings.admin_algorithm
+ADMIN_TOKEN_EXPIRE_MINUTES = settings.admin_token_expire_minutes
 
 # -------------------------------------------------
 # Router
@@ -164,11 +150,3 @@ def change_admin_password(
     db.commit()
 
     return {"message": "Password changed successfully"}
-
-# -------------------------------------------------
-# STARTUP
-# -------------------------------------------------
-@router.on_event("startup")
-def ensure_admin():
-    db = next(get_db())
-    create_default_admin(db)
@@ -1,31 +1,30 @@
 from fastapi import APIRouter, Request, Form, Depends, HTTPException, status
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from uuid import uuid4
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-import os
-from dotenv import load_dotenv
 from fastapi import Cookie
 
+from app.core.config import get_settings
+from app.core.templates import templates, static_page
 from app.database.session import get_db
+from app.models.address import UserAddress
 from app.models.user import User
 from app.schemas.user import ResetPasswordRequest
 from app.schemas.user import UserAddressUpdate, Address
-from sqlalchemy.orm.attributes import flag_modified
-
-# Load environment variables
-load_dotenv()
+from app.services.phones import normalize_phone
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.exc import IntegrityError
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # JWT CONFIG
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
+settings = get_settings()
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
 # Password Hasher
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -50,6 +49,17 @@ def hash_answer(answer: str) -> str:
 def verify_answer(answer: str, hashed: str) -> bool:
     return pwd_context.verify(answer.lower().strip(), hashed)
 
+def find_user_by_phone(db: Session, phone: str):
+    # normalized form, plus the exact input for the few legacy numbers
+    # migration 0007 could not normalize (duplicate accounts)
+    raw = (phone or "").strip()
+    return (
+        db.query(User)
+        .filter(User.mobile_number.in_({normalize_phone(phone), raw}))
+        .order_by((User.mobile_number == raw).desc())
+        .first()
+    )
+
 def get_current_user(
     access_token: str | None = Cookie(default=None),
     db: Session = Depends(get_db)
@@ -98,6 +108,10 @@ async def register(
     if password != confirmPassword:
         return JSONResponse(status_code=400, content={"error": "Passwords do not match"})
 
+    phone = normalize_phone(phone)
+    if len(phone) != 10:
+        return JSONResponse(status_code=400, content={"error": "Please enter a valid 10-digit phone number"})
+
     existing = db.query(User).filter(User.mobile_number == phone).first()
     if existing:
         return JSONResponse(status_code=400, content={"error": "Mobile number already registered"})
@@ -139,7 +153,7 @@ def login(
     Login user with phone number and password.
     Returns access token as httpOnly cookie and user info in response.
     """
-    user = db.query(User).filter(User.mobile_number == mobile_number).first()
+    user = find_user_by_phone(db, mobile_number)
     
     if not user or not verify_password(password, user.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -190,7 +204,7 @@ def forgot_password_verify(
     Step 1: Verify user identity using phone number and security questions.
     Returns success if answers match stored hashed answers.
     """
-    user = db.query(User).filter(User.mobile_number == phone).first()
+    user = find_user_by_phone(db, phone)
 
     if not user or not user.security_questions:
         raise HTTPException(status_code=404, detail="User not found")
@@ -217,7 +231,7 @@ def forgot_password_reset(
     if new_password != confirm_password:
         raise HTTPException(status_code=400, detail="Passwords do not match")
 
-    user = db.query(User).filter(User.mobile_number == phone).first()
+    user = find_user_by_phone(db, phone)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -228,76 +242,106 @@ def forgot_password_reset(
 
 # ================== ADDRESS MANAGEMENT ROUTES ================== #
 
+ADDRESS_FIELDS = ("line1", "line2", "city", "state", "pincode", "type")
+ADDRESS_COLUMNS = (UserAddress.id, *(getattr(UserAddress, f) for f in ADDRESS_FIELDS))
+
+
+def address_values(address: Address):
+    return address.model_dump(include=set(ADDRESS_FIELDS))
+
+
 @router.get("/api/user/addresses")
 def get_user_saved_address(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all saved addresses for the current user"""
-    addresses = current_user.address or []
+    addresses = [
+        dict(row)
+        for row in db.execute(
+            select(*ADDRESS_COLUMNS)
+            .where(UserAddress.user_id == current_user.id)
+            .order_by(UserAddress.id)
+        ).mappings()
+    ]
     return {
         "addresses": addresses,
         "count": len(addresses)
     }
 
 @router.post("/api/user/address")
-async def save_user_address(
+def save_user_address(
     payload: UserAddressUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Save a new address for the current user"""
-    if current_user.address is None:
-        current_user.address = []
+    """Save a new address for the current user (id is assigned by the server)"""
+    values = address_values(payload.address)
 
-    new_address = payload.address.model_dump()
-
-    is_duplicate = any(
-        addr.get("line1") == new_address.get("line1") and
-        addr.get("pincode") == new_address.get("pincode")
-        for addr in current_user.address
-    )
-    if is_duplicate:
+    try:
+        result = db.execute(insert(UserAddress).values(user_id=current_user.id, **values))
+        db.commit()
+    except IntegrityError:
+        # uq_user_addresses_user_line1_pincode
+        db.rollback()
         return JSONResponse(status_code=400, content={"message": "Address already exists"})
 
-    current_user.address.append(new_address)
-    flag_modified(current_user, "address")
-    db.commit()
-
-    return JSONResponse(status_code=200, content={"message": "Address saved successfully"})
+    return JSONResponse(status_code=200, content={
+        "message": "Address saved successfully",
+        "address": {"id": result.inserted_primary_key[0], **values},
+    })
 
 @router.delete("/api/user/address/{address_id}")
-async def delete_user_address(
+def delete_user_address(
     address_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete an address for the current user"""
-    current_user.address = [
-        addr for addr in current_user.address
-        if addr.get("id") != address_id
-    ]
-    flag_modified(current_user, "address")
+    result = db.execute(
+        delete(UserAddress).where(
+            UserAddress.id == address_id,
+            UserAddress.user_id == current_user.id,
+        )
+    )
     db.commit()
 
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Address not found")
+
     return JSONResponse(status_code=200, content={"message": "Address deleted successfully"})
 
 @router.put("/api/user/address/{address_id}")
-async def update_user_address(
+def update_user_address(
     address_id: int,
     address: Address,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update an existing address for the current user"""
-    for i, addr in enumerate(current_user.address or []):
-        if addr.get("id") == address_id:
-            current_user.address[i] = address.model_dump()
-            flag_modified(current_user, "address")
-            db.commit()
-            return JSONResponse(status_code=200, content={"message": "Address updated successfully"})
+    values = address_values(address)
+
+    try:
+        result = db.execute(
+            update(UserAddress)
+            .where(
+                UserAddress.id == address_id,
+                UserAddress.user_id == current_user.id,
+            )
+            .values(**values)
+        )
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return JSONResponse(status_code=400, content={"message": "Address already exists"})
 
-    raise HTTPException(status_code=404, detail="Address not found")
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Address not found")
+
+    return JSONResponse(status_code=200, content={
+        "message": "Address updated successfully",
+        "address": {"id": address_id, **values},
+    })
 
 # ================== PAGE ROUTES ================== #
 
@@ -361,12 +405,7 @@ def orders_page(
 @router.get("/terms-and-conditions", response_class=HTMLResponse)
 def terms_and_conditions_page(request: Request):
     """Terms and conditions page (public)"""
-    return templates.TemplateResponse(
-        "termscondition.html",
-        {
-            "request": request
-        }
-    )
+    return static_page(request, "termscondition.html")
 # ================== CHANGE PASSWORD ROUTE ================== #
 
 @router.post("/change-password")
@@ -389,7 +428,7 @@ def change_password(
         )
 
     # 2️⃣ Get user
-    user = db.query(User).filter(User.mobile_number == phone).first()
+    user = find_user_by_phone(db, phone)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,31 +1,27 @@
 from fastapi import APIRouter, Request, Form, Depends, HTTPException, status
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from uuid import uuid4
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-import os
-from dotenv import load_dotenv
 from fastapi import Cookie
 
+from app.core.config import get_settings
+from app.core.templates import templates, static_page
 from app.database.session import get_db
 from app.models.user import User
 from app.schemas.user import ResetPasswordRequest
 from app.schemas.user import UserAddressUpdate, Address
 from sqlalchemy.orm.attributes import flag_modified
 
-# Load environment variables
-load_dotenv()
-
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # JWT CONFIG
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
+settings = get_settings()
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
 # Password Hasher
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -361,9 +357,4 @@ def orders_page(
 @router.get("/terms-and-conditions", response_class=HTMLResponse)
 def terms_and_conditions_page(request: Request):
     """Terms and conditions page (public)"""
-    return templates.TemplateResponse(
-        "termscondition.html",
-        {
-            "request": request
-        }
-    )
+    return static_page(request, "termscondition.html")
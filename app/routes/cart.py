@@ -1,14 +1,22 @@
+from datetime import date, timedelta
+
 from fastapi import APIRouter, Request, Depends
+from sqlalchemy.orm import Session
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
-from typing import Dict, List
+from typing import Any, Dict, List
 
+from app.core.templates import templates
 from app.database.session import get_db
 from app.models.user import User
 from app.routes.auth import get_current_user  # ✅ REUSE AUTH LOGIC
+from app.core.config import get_settings
+from app.schemas.cart import CartPriceRequest, CartDiff, CartItems, DeliverySlotsRequest
+from app.services.capacity import delivery_slots, earliest_date
+from app.services.units import items_load
+from app.services.carts import cart_store
+from app.services.pricing import get_price_index
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # -------------------------------------------------
 # CART PAGE (PROTECTED)
@@ -35,18 +43,101 @@ def orders_page(
     )
 
 # -------------------------------------------------
-# CART SYNC API (OPTIONAL / FUTURE USE)
+# CART PRICING (server-side, one call per cart)
+# -------------------------------------------------
+@router.post("/api/cart/price")
+def price_cart(
+    payload: CartPriceRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Current prices for every cart line + subtotal / shipping / total,
+    answered from the in-memory price index (no per-item queries)
+    """
+    return get_price_index(db).price_cart([line.model_dump() for line in payload.items])
+
+# -------------------------------------------------
+# DELIVERY SLOTS (dates the kitchen can still take this cart)
+# -------------------------------------------------
+@router.post("/api/delivery-slots")
+def get_delivery_slots(
+    payload: DeliverySlotsRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    One range read of delivery_capacity for the whole window
+    """
+    items = [line.model_dump() for line in payload.items]
+    start = earliest_date(get_price_index(db).lead_time_days(items))
+
+    # same window as the cart date picker: earliest .. today + DELIVERY_SLOT_DAYS
+    last = date.today() + timedelta(days=get_settings().delivery_slot_days)
+    days = max((last - start).days + 1, 1)
+    if payload.days:
+        days = min(days, max(payload.days, 1))
+
+    grams, pieces = items_load(items)
+    return {
+        "earliest": start.isoformat(),
+        "slots": delivery_slots(db, grams, pieces, start, days),
+    }
+
+# -------------------------------------------------
+# SERVER-SIDE CART (`carts` table, or a redis / memory store written behind)
+# -------------------------------------------------
+@router.get("/api/cart")
+def get_cart(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    return cart_store.get(db, user.id)
+
+
+@router.patch("/api/cart")
+def patch_cart(
+    payload: CartDiff,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Apply a few line edits. Returns only the new version unless the
+    client's base_version was stale — then the full cart to resync from.
+    """
+    ops = [op.model_dump(exclude_none=True) for op in payload.ops]
+    cart = cart_store.apply(db, user.id, ops)
+
+    if payload.base_version is not None and payload.base_version + 1 == cart["version"]:
+        return {"version": cart["version"]}
+    return cart
+
+
+@router.post("/api/cart/merge")
+def merge_cart(
+    payload: CartItems,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    On login: fold the browser's guest cart into the account cart
+    """
+    return cart_store.merge(db, user.id, payload.items)
+
+
+# -------------------------------------------------
+# CART SYNC API (legacy full-cart payload)
 # -------------------------------------------------
 @router.post("/api/cart/sync")
 def sync_cart(
-    cart_data: Dict[str, List],
+    cart_data: Dict[str, List[Any]],
+    db: Session = Depends(get_db),
     user: User = Depends(get_current_user),  # ✅ AUTH FROM auth.py
 ):
+    cart = cart_store.replace(db, user.id, cart_data.get("cart") or [])
     return JSONResponse(
         {
             "status": "success",
             "message": "Cart synced successfully",
             "user_id": user.id,
-            "data": cart_data,
+            "data": {"cart": cart["items"], "version": cart["version"]},
         }
     )
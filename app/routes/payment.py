@@ -3,57 +3,59 @@ from fastapi import (
     HTTPException,
     Request,
     Depends,
+    Query,
 )
-from sqlalchemy.orm import Session, joinedload
-from datetime import datetime
-import razorpay
-import os
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
 import hmac
 import hashlib
 import json
 
+from app.core.config import get_settings
 from app.database.session import get_db
 from app.models.orders import Order
 from app.models.user import User
 from app.routes.auth import get_current_user
-
-from dotenv import load_dotenv
-load_dotenv()
+from app.services.archive import find_archived, newest_first
+from app.services.capacity import date_available, order_status_changed
+from app.services.carts import cart_store
+from app.services.gateway import get_razorpay_client, signature_error
+from app.services.idempotency import IdempotencyStore, cart_fingerprint
+from app.services.phones import normalize_phone
+from app.services.pricing import get_price_index
 
 router = APIRouter()
 
 # --------------------------------------------------
 # RAZORPAY CONFIG
 # --------------------------------------------------
-RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID")
-RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET")
-
-if not RAZORPAY_KEY_ID or not RAZORPAY_KEY_SECRET:
-    raise RuntimeError("Razorpay keys not configured")
+settings = get_settings()
+RAZORPAY_KEY_ID = settings.razorpay_key_id
 
-razorpay_client = razorpay.Client(
-    auth=(RAZORPAY_KEY_ID, RAZORPAY_KEY_SECRET)
-)
 
 # --------------------------------------------------
-# CREATE ORDER (JWT REQUIRED)
+# CHECKOUT IDEMPOTENCY
 # --------------------------------------------------
-@router.post("/create-order/")
-async def create_order(
-    data: dict,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    amount = data.get("amount")
-    items = data.get("items")
-    address = data.get("deliveryAddress")
-    delivery_date = data.get("deliveryDate")
+# Razorpay orders stay payable for a while, so a retry / double click for
+# the same cart within this window gets the existing pending order back.
+CHECKOUT_IDEMPOTENCY_TTL = settings.checkout_idempotency_ttl
+
+checkout_store = IdempotencyStore(ttl_seconds=CHECKOUT_IDEMPOTENCY_TTL)
 
-    if not amount or not items or not address:
-        raise HTTPException(status_code=400, detail="Missing order data")
 
+def find_pending_order(db: Session, user_id: int, key: str):
+    return db.query(Order).filter(
+        Order.idempotency_key == key,
+        Order.user_id == user_id,
+        Order.order_status == "pending",
+        Order.created_at >= datetime.utcnow() - timedelta(seconds=CHECKOUT_IDEMPOTENCY_TTL),
+    ).order_by(Order.id.desc()).first()
+
+
+def create_gateway_order(db, current_user, key, amount, items, address, delivery_date):
+    # one gateway round trip + one pending Order row
+    razorpay_client = get_razorpay_client()
     try:
-        # ✅ ALWAYS CREATE A NEW RAZORPAY ORDER
         razorpay_order = razorpay_client.order.create({
             "amount": int(amount * 100),  # paise
             "currency": "INR",
@@ -63,11 +65,12 @@ async def create_order(
         new_order = Order(
             user_id=current_user.id,
             first_name=current_user.first_name,
-            mobile_number=current_user.mobile_number,
+            mobile_number=normalize_phone(current_user.mobile_number) or None,
             address=address,
             items=items,
             total_amount=amount,
             razorpay_order_id=razorpay_order["id"],
+            idempotency_key=key,
             order_status="pending",
             delivery_date=datetime.strptime(
                 delivery_date, "%Y-%m-%d"
@@ -77,17 +80,100 @@ async def create_order(
 
         db.add(new_order)
         db.commit()
-        db.refresh(new_order)
+        checkout_store.put(key, razorpay_order["id"])
 
         return {
             "order_id": razorpay_order["id"],
             "key": RAZORPAY_KEY_ID,
+            "amount": amount,
         }
 
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+# --------------------------------------------------
+# CREATE ORDER (JWT REQUIRED)
+# --------------------------------------------------
+@router.post("/create-order/")
+async def create_order(
+    data: dict,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    amount = data.get("amount")
+    items = data.get("items")
+    address = data.get("deliveryAddress")
+    delivery_date = data.get("deliveryDate")
+
+    if not amount or not items or not address:
+        raise HTTPException(status_code=400, detail="Missing order data")
+
+    # ✅ never trust client prices — reprice from the in-memory index
+    index = get_price_index(db)
+    quote = index.price_cart(items)
+    if quote["unavailable"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Some items are unavailable: " + ", ".join(
+                f"{u['id']} ({u['error']})" for u in quote["unavailable"]
+            ),
+        )
+
+    if abs(float(amount) - quote["total"]) > 0.01:
+        print(f"⚠️ Client amount {amount} != server total {quote['total']} (user {current_user.id})")
+
+    amount = quote["total"]
+    items = [
+        {**item, "price": line["price"], "quantity": line["quantity"]}
+        for item, line in zip(items, quote["items"])
+    ]
+
+    # ✅ the kitchen must still have room on that day
+    if delivery_date:
+        try:
+            day = datetime.strptime(delivery_date, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid delivery date")
+        if not date_available(db, day, items, index.lead_time_days(items)):
+            raise HTTPException(
+                status_code=400,
+                detail="Delivery date is no longer available, please pick another day",
+            )
+
+    client_key = request.headers.get("Idempotency-Key")
+    if client_key:
+        key = hashlib.sha256(f"{current_user.id}:{client_key}".encode()).hexdigest()
+    else:
+        key = cart_fingerprint(current_user.id, items, address, delivery_date, amount)
+
+    async with checkout_store.lock(key):
+        # ✅ fast path: same cart checked out moments ago on this worker
+        razorpay_order_id = checkout_store.get(key)
+        if razorpay_order_id:
+            existing = db.query(Order).filter(
+                Order.razorpay_order_id == razorpay_order_id,
+                Order.order_status == "pending",
+            ).first()
+        else:
+            # other workers / restarts — indexed lookup, no gateway call
+            existing = find_pending_order(db, current_user.id, key)
+
+        if existing:
+            checkout_store.put(key, existing.razorpay_order_id)
+            return {
+                "order_id": existing.razorpay_order_id,
+                "key": RAZORPAY_KEY_ID,
+                "amount": existing.total_amount,
+                "reused": True,
+            }
+
+        checkout_store.forget(key)
+        return create_gateway_order(
+            db, current_user, key, amount, items, address, delivery_date
+        )
+
 # --------------------------------------------------
 # VERIFY PAYMENT (JWT REQUIRED)
 # --------------------------------------------------
@@ -108,20 +194,22 @@ async def verify_payment(
         raise HTTPException(status_code=400, detail="Invalid payment data")
 
     # ✅ VERIFY SIGNATURE
+    razorpay_client = get_razorpay_client()
+
     try:
         razorpay_client.utility.verify_payment_signature({
             "razorpay_order_id": razorpay_order_id,
             "razorpay_payment_id": razorpay_payment_id,
             "razorpay_signature": razorpay_signature,
         })
-    except razorpay.errors.SignatureVerificationError:
+    except signature_error(razorpay_client):
         raise HTTPException(status_code=400, detail="Invalid payment signature")
 
     # ✅ FETCH ORDER (BOUND TO USER)
     order = db.query(Order).filter(
         Order.razorpay_order_id == razorpay_order_id,
         Order.user_id == current_user.id,
-    ).first()
+    ).with_for_update().first()
 
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
@@ -133,13 +221,17 @@ async def verify_payment(
             "order_id": order.id,
         }
 
-    # ✅ UPDATE ORDER
+    # ✅ UPDATE ORDER (+ book kitchen capacity for the delivery date)
+    order_status_changed(db, order, order.order_status, "placed")
     order.order_status = "placed"
     order.razorpay_payment_id = razorpay_payment_id
     order.updated_at = datetime.utcnow()
 
     db.commit()
 
+    # ✅ paid — empty the server-side cart
+    cart_store.clear(db, current_user.id)
+
     return {
         "status": "success",
         "order_id": order.id,
@@ -150,7 +242,7 @@ async def razorpay_webhook(
     request: Request,
     db: Session = Depends(get_db),
 ):
-    webhook_secret = os.getenv("RAZORPAY_WEBHOOK_SECRET")
+    webhook_secret = settings.razorpay_webhook_secret
 
     if not webhook_secret:
         raise HTTPException(status_code=500, detail="Webhook secret not configured")
@@ -188,9 +280,10 @@ async def razorpay_webhook(
 
         order = db.query(Order).filter(
             Order.razorpay_order_id == razorpay_order_id
-        ).first()
+        ).with_for_update().first()
 
         if order and order.order_status != "placed":
+            order_status_changed(db, order, order.order_status, "placed")
             order.order_status = "placed"
             order.razorpay_payment_id = razorpay_payment_id
             order.updated_at = datetime.utcnow()
@@ -221,36 +314,84 @@ async def razorpay_webhook(
 # --------------------------------------------------
 # GET USER ORDERS
 # --------------------------------------------------
+ORDER_SUMMARY_COLUMNS = (
+    Order.id,
+    Order.razorpay_order_id,
+    Order.delivery_date,
+    Order.total_amount,
+    Order.order_status,
+    Order.created_at,
+)
+
+
+def order_summary(o):
+    return {
+        "id": o.id,
+        "razorpay_order_id": o.razorpay_order_id,
+        "delivery_date": o.delivery_date.isoformat() if o.delivery_date else None,
+        "total_amount": float(o.total_amount),
+        "order_status": o.order_status,
+        "created_at": o.created_at.isoformat() if o.created_at else None,
+    }
+
+
 @router.get("/api/orders")
-async def get_orders(
+def get_orders(
+    summary: bool = False,
+    limit: int | None = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    orders = (
-        db.query(Order)
-        .options(joinedload(Order.user))
-        .filter(Order.user_id == current_user.id)
-        .order_by(Order.created_at.desc())
-        .all()
+    """
+    Customer order history — served by ix_orders_user_id_created_at (and its
+    orders_archive twin once the customer has archived orders).
+    summary=true skips the large items / address JSON columns.
+    """
+    columns = ORDER_SUMMARY_COLUMNS if summary else (*ORDER_SUMMARY_COLUMNS, Order.items, Order.address)
+
+    # older finished orders may live in orders_archive
+    rows = newest_first(
+        db,
+        [c.key for c in columns],
+        lambda model: [model.user_id == current_user.id],
+        offset=offset,
+        limit=limit,
     )
 
+    data = []
+    for o in rows:
+        row = order_summary(o)
+        if not summary:
+            row["items"] = o.items
+            row["address"] = o.address
+        data.append(row)
+
     return {
-        "data": [
-            {
-                "id": o.id,
-                "razorpay_order_id": o.razorpay_order_id,
-                "delivery_date": o.delivery_date.isoformat() if o.delivery_date else None,
-                "total_amount": float(o.total_amount),
-                "order_status": o.order_status,
-                "created_at": o.created_at.isoformat(),
-                "items": o.items,
-                "address": o.address,
-            }
-            for o in orders
-        ],
+        "data": data,
         "message": "Orders fetched successfully",
     }
 
+
+@router.get("/api/orders/{order_id}")
+def get_order_detail(
+    order_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    o = (
+        db.query(*ORDER_SUMMARY_COLUMNS, Order.items, Order.address)
+        .filter(Order.id == order_id, Order.user_id == current_user.id)
+        .first()
+    ) or find_archived(db, order_id, current_user.id)
+    if not o:
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    return {
+        "data": {**order_summary(o), "items": o.items, "address": o.address},
+        "message": "Order fetched successfully",
+    }
+
 # --------------------------------------------------
 # CANCEL ORDER
 # --------------------------------------------------
@@ -274,6 +415,7 @@ async def cancel_order(
             detail=f"Cannot cancel order in '{order.order_status}' state",
         )
 
+    order_status_changed(db, order, order.order_status, "cancelled")
     order.order_status = "cancelled"
     db.commit()
 
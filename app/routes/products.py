@@ -4,22 +4,25 @@ from fastapi import (
     HTTPException,
     Request,
     Depends,
+    Query,
     status,
 )
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
-from typing import Literal
+from typing import Literal, Optional
 import traceback
 
-from app.database.session import get_db
+from app.core.templates import static_page
+from app.database.session import get_read_db
 from app.models.product import Product
 from app.schemas.product import ProductsCreate
 from app.models.user import User
 from app.routes.auth import get_current_user  # ✅ reuse auth
+from app.services.search import search_products
+from app.services.categories import get_category_index
+from app.services.images import image_set
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # ----------------------------------------------------
 # HTML PAGES (PUBLIC)
@@ -27,12 +30,12 @@ templates = Jinja2Templates(directory="templates")
 
 @router.get("/product", response_class=HTMLResponse)
 def product_page(request: Request):
-    return templates.TemplateResponse("products.html", {"request": request})
+    return static_page(request, "products.html")
 
 
 @router.get("/product-details.html", response_class=HTMLResponse)
 def product_details(request: Request):
-    return templates.TemplateResponse("product-details.html", {"request": request})
+    return static_page(request, "product-details.html")
 
 
 # ----------------------------------------------------
@@ -40,12 +43,19 @@ def product_details(request: Request):
 # ----------------------------------------------------
 
 @router.get("/api/products")
-def get_all_products(db: Session = Depends(get_db)):
+def get_all_products(
+    category: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
     current_user: User = Depends(get_current_user),  # ✅ JWT
 
     """
     Public product listing (only enabled products)
+    ?category= is answered from the in-memory category index
     """
+    if category:
+        return get_category_index(db).products(category)
+
     products = db.query(Product).filter(Product.is_enabled == True).all()
     product_list = []
 
@@ -67,6 +77,7 @@ def get_all_products(db: Session = Depends(get_db)):
             "category": p.category,
             "description": p.description,
             "image_url": p.imagesrc,
+            "images": image_set(p.imagesrc, p.image_variants),
             "variants": variants,
             "max_price": max((v["price"] for v in variants), default=0),
         })
@@ -80,7 +91,7 @@ def get_all_products(db: Session = Depends(get_db)):
 
 @router.get("/api/products-state")
 def get_all_products_with_status(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_user),  # ✅ JWT
 ):
     """
@@ -107,6 +118,7 @@ def get_all_products_with_status(
             "category": p.category,
             "description": p.description,
             "image_url": p.imagesrc,
+            "images": image_set(p.imagesrc, p.image_variants),
 
             "packing_01": p.packing_01,
             "price_01": float(p.price_01) if p.price_01 else None,
@@ -126,8 +138,29 @@ def get_all_products_with_status(
 
     return result
 
+@router.get("/api/products/facets")
+def product_facets(db: Session = Depends(get_read_db)):
+    """
+    Enabled product counts + price range per category
+    """
+    return get_category_index(db).facets()
+
+
+@router.get("/api/products/search")
+def search_product_catalog(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Ranked prefix + typo-tolerant search over enabled products
+    (in-memory index, rebuilt after catalog changes)
+    """
+    return search_products(db, q, limit)
+
+
 @router.get("/api/products/{product_id}")
-def get_product_by_id(product_id: int, db: Session = Depends(get_db)):
+def get_product_by_id(product_id: int, db: Session = Depends(get_read_db)):
     p = db.query(Product).filter(
         Product.id == product_id,
         Product.is_enabled == True
@@ -152,6 +185,7 @@ def get_product_by_id(product_id: int, db: Session = Depends(get_db)):
         "category": p.category,
         "description": p.description,
         "image_url": p.imagesrc,
+        "images": image_set(p.imagesrc, p.image_variants),
         "variants": variants,
         "shelf_life_days": p.shelf_life_days,
         "lead_time_days": p.lead_time_days,
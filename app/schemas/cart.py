@@ -0,0 +1,36 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, List, Literal, Optional
+
+
+class CartLine(BaseModel):
+    id: int
+    variant: Optional[str] = None
+    quantity: int = 1
+
+
+class CartPriceRequest(BaseModel):
+    items: List[CartLine]
+
+
+class DeliverySlotsRequest(BaseModel):
+    items: List[CartLine]
+    days: Optional[int] = None
+
+
+class CartOp(BaseModel):
+    # extra keys (name, price, image, ...) are kept on the line for display
+    model_config = ConfigDict(extra="allow")
+
+    op: Literal["set", "remove", "clear"]
+    id: Optional[int] = None
+    variant: Optional[str] = None
+    quantity: Optional[int] = None
+
+
+class CartDiff(BaseModel):
+    base_version: Optional[int] = None
+    ops: List[CartOp]
+
+
+class CartItems(BaseModel):
+    items: List[Dict[str, Any]]
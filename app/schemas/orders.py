@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import List, Dict, Any, Optional
+from datetime import date, datetime
 
 class UserDetails(BaseModel):
     id: int
@@ -27,3 +27,40 @@ class OrderCreateSchema(BaseModel):
 
 class OrderStatusUpdate(BaseModel):
     order_status: str
+
+class BulkOrderStatusUpdate(BaseModel):
+    order_ids: List[int]
+    order_status: str
+
+
+# ✅ admin orders screen — only the fields the table / details modal show
+class AdminOrderItem(BaseModel):
+    name: Optional[str] = None
+    variant: Optional[str] = None
+    quantity: Optional[int] = 0
+    price: Optional[float] = 0
+    originalPrice: Optional[float] = None
+
+
+class AdminOrderAddress(BaseModel):
+    line1: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    pincode: Optional[str | int] = None
+
+
+class AdminOrderRow(BaseModel):
+    id: int
+    razorpay_order_id: Optional[str] = None
+    # first_name / mobile_number: the Next.js admin panel;
+    # customer_name / phone_number: static/js/admin.js
+    first_name: Optional[str] = None
+    mobile_number: Optional[str] = None
+    customer_name: Optional[str] = None
+    phone_number: Optional[str] = None
+    created_at: Optional[datetime] = None
+    delivery_date: Optional[date] = None
+    total_amount: float
+    order_status: Optional[str] = None
+    items: List[AdminOrderItem] = []
+    address: AdminOrderAddress = AdminOrderAddress()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 class ProductCreate(BaseModel):
@@ -18,6 +18,7 @@ class ProductCreate(BaseModel):
     price_04: Optional[float] = None
     description: Optional[str] = None
     imagesrc: Optional[str] = None
+    image_variants: Optional[Dict[str, Any]] = None
     is_enabled: Optional[bool] = True  # ✅ Add this field
 
     class Config:
@@ -42,6 +43,18 @@ class ProductsCreate(BaseModel):
     price_04: Optional[float] = None
     description: Optional[str] = None
     imagesrc: Optional[str] = None
+    image_variants: Optional[Dict[str, Any]] = None
 
     class Config:
         from_attributes = True  # Pydantic v2
+
+
+# ✅ Bulk import row (id optional — match by id, else by item_name)
+class ProductImportRow(ProductsCreate):
+    id: Optional[int] = None
+    is_enabled: Optional[bool] = None
+
+
+class ProductBulkToggle(BaseModel):
+    product_ids: List[int]
+    is_enabled: bool
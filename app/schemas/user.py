@@ -21,7 +21,7 @@ class ResetPasswordRequest(BaseModel):
 
 # Address Schema
 class Address(BaseModel):
-    id: int 
+    id: Optional[int] = None  # server-assigned; ignored on create / update
     line1: str
     line2: Optional[str] = None
     city: str
@@ -30,7 +30,7 @@ class Address(BaseModel):
     type: str = "home"
 
 class UserAddressUpdate(BaseModel):
-    id: int
+    id: Optional[int] = None
     address: Address
 
 # Response Schema
@@ -0,0 +1,214 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.orders import Order, OrderArchive
+from app.services.cache import TTLCache
+from app.services.invalidation import bus
+
+# ------------------------------------------------------
+# HOT / COLD ORDERS
+# ------------------------------------------------------
+# Finished orders older than ORDER_ARCHIVE_AFTER_DAYS are moved in batches
+# from `orders` into `orders_archive` (same columns, month-partitioned on
+# MySQL). Reads that can reach archived rows go through order_rows(), a
+# UNION ALL of both tables with the same filters. It is used only when the
+# request can touch archived data: the archive is not empty, the date
+# range starts at or before the newest archived created_at, and the
+# status filter includes an archived status.
+
+ARCHIVED_STATUSES = {"delivered", "completed", "cancelled", "rejected", "failed", "expired"}
+
+BATCH_SIZE = 500
+MAX_BATCHES = 20
+
+_horizon_cache = TTLCache(ttl_seconds=60)
+# the archiving worker tells the others their horizon moved (when there is
+# a bus — archive_horizon() does not rely on it)
+bus.subscribe("orders_archive", lambda key: _horizon_cache.invalidate())
+
+
+def archive_horizon(db: Session):
+    """
+    Upper bound on the newest created_at in orders_archive (None while it
+    is empty). Never lower than the truth, however stale the cache:
+      - an empty archive is not cached — MAX() over an empty table is
+        free, and another worker may have just archived into it;
+      - otherwise the cached MAX() is lifted to the archiving cutoff, since
+        the job only moves orders created before now - after_days.
+    """
+    horizon = _horizon_cache.get_or_compute(
+        "horizon", lambda: db.query(func.max(OrderArchive.created_at)).scalar()
+    )
+    if horizon is None:
+        _horizon_cache.invalidate("horizon")
+        return None
+
+    after_days = get_settings().order_archive_after_days
+    if after_days > 0:
+        horizon = max(horizon, datetime.utcnow() - timedelta(days=after_days))
+    return horizon
+
+
+def needs_archive(db: Session, date_from=None, statuses=None) -> bool:
+    if statuses and not set(statuses) & ARCHIVED_STATUSES:
+        return False
+    horizon = archive_horizon(db)
+    if horizon is None:
+        return False
+    if date_from is not None:
+        if not isinstance(date_from, datetime):
+            date_from = datetime.combine(date_from, datetime.min.time())
+        return date_from <= horizon
+    return True
+
+
+def order_rows(names, where=lambda model: [], include_archive=True):
+    """
+    Subquery with columns `names` from orders (+ orders_archive), each side
+    filtered by where(model) so both use their own indexes.
+    """
+    def side(model):
+        return select(*[getattr(model, n).label(n) for n in names]).where(*where(model))
+
+    if not include_archive:
+        return side(Order).subquery("orders_all")
+    return union_all(side(Order), side(OrderArchive)).subquery("orders_all")
+
+
+def newest_first(db: Session, names, where=lambda model: [], offset: int = 0, limit: int = None,
+                 date_from=None, statuses=None):
+    """
+    Rows ordered by created_at DESC, id DESC across both tables. The hot
+    table alone answers when the page is full and ends after the newest
+    archived order (archived rows can only sort after it).
+    """
+    hot = order_rows(names, where, include_archive=False)
+    query = (
+        db.query(hot)
+        .order_by(hot.c.created_at.desc(), hot.c.id.desc())
+        .offset(offset)
+    )
+    rows = (query.limit(limit) if limit else query).all()
+
+    if not needs_archive(db, date_from, statuses):
+        return rows
+    horizon = archive_horizon(db)
+    if limit and len(rows) == limit and rows[-1].created_at and rows[-1].created_at > horizon:
+        return rows
+
+    both = order_rows(names, where)
+    query = (
+        db.query(both)
+        .order_by(both.c.created_at.desc(), both.c.id.desc())
+        .offset(offset)
+    )
+    return (query.limit(limit) if limit else query).all()
+
+
+def find_archived(db: Session, order_id: int, user_id: int = None, for_update: bool = False):
+    query = db.query(OrderArchive).filter(OrderArchive.id == order_id)
+    if user_id is not None:
+        query = query.filter(OrderArchive.user_id == user_id)
+    if for_update:
+        query = query.with_for_update()
+    return query.first()
+
+
+# ------------------------------------------------------
+# MONTH PARTITIONS (MySQL)
+# ------------------------------------------------------
+def _month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def ensure_partitions(db: Session, months):
+    """
+    Split one partition per month off the catch-all `pmax`, for months
+    newer than the last existing partition (archival runs oldest first, so
+    months only ever grow). DDL commits implicitly — call before the batch.
+    """
+    if db.get_bind().dialect.name != "mysql":
+        return
+
+    existing = {
+        name for (name,) in db.execute(text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'orders_archive'"
+        ))
+        if name and name != "pmax"
+    }
+    last = max(existing, default=None)
+
+    for month in sorted(months):
+        name = f"p{month:%Y%m}"
+        if name in existing or (last and name < last):
+            continue
+        db.execute(text(
+            f"ALTER TABLE orders_archive REORGANIZE PARTITION pmax INTO ("
+            f"PARTITION {name} VALUES LESS THAN (TO_DAYS('{_next_month(month):%Y-%m-%d}')), "
+            f"PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        ))
+        existing.add(name)
+        last = name
+
+
+# ------------------------------------------------------
+# ARCHIVAL JOB (run by app.services.scheduler)
+# ------------------------------------------------------
+ARCHIVE_COLUMNS = [c.name for c in Order.__table__.columns]
+
+
+def archive_orders(db: Session, after_days: int):
+    cutoff = datetime.utcnow() - timedelta(days=after_days)
+    archived = 0
+
+    for _ in range(MAX_BATCHES):
+        batch = (
+            db.query(Order.id, Order.created_at)
+            .filter(Order.order_status.in_(ARCHIVED_STATUSES), Order.created_at < cutoff)
+            .order_by(Order.created_at)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not batch:
+            break
+
+        ensure_partitions(db, {_month_start(created_at.date()) for _, created_at in batch})
+
+        ids = [order_id for order_id, _ in batch]
+        # same transaction: copy then delete, rows locked against status changes
+        locked = [
+            order_id for (order_id,) in db.query(Order.id)
+            .filter(Order.id.in_(ids), Order.order_status.in_(ARCHIVED_STATUSES))
+            .with_for_update()
+        ]
+        if locked:
+            db.execute(
+                insert(OrderArchive).from_select(
+                    ARCHIVE_COLUMNS,
+                    select(*[Order.__table__.c[name] for name in ARCHIVE_COLUMNS])
+                    .where(Order.id.in_(locked)),
+                )
+            )
+            db.execute(
+                delete(Order)
+                .where(Order.id.in_(locked))
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        archived += len(locked)
+
+        if len(batch) < BATCH_SIZE:
+            break
+
+    if archived:
+        _horizon_cache.invalidate()
+        bus.publish("orders_archive")
+    return {"archived": archived}
@@ -0,0 +1,45 @@
+import json
+import logging
+from datetime import datetime
+
+logger = logging.getLogger("orderms.audit")
+
+
+def configure_audit_log(path: str = None):
+    """
+    Nothing else configures logging (uvicorn only sets up its own loggers),
+    so without this the INFO records below are dropped at the root's
+    WARNING level. One JSON line per record to `path`, else stderr.
+    Safe to call again (one handler per process).
+    """
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if logger.handlers:
+        return
+    handler = logging.FileHandler(path) if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+
+
+# ------------------------------------------------------
+# ORDER STATUS AUDIT
+# ------------------------------------------------------
+def record_order_status_batch(actor: str, target_status: str, transitions: list):
+    """
+    Emit ONE audit record for a batch of order status changes.
+
+    transitions: [{"id": 12, "from": "confirmed", "to": "inprocess"}, ...]
+    """
+    if not transitions:
+        return
+
+    logger.info(
+        json.dumps({
+            "event": "order_status_batch",
+            "actor": actor,
+            "target_status": target_status,
+            "count": len(transitions),
+            "transitions": transitions,
+            "at": datetime.utcnow().isoformat(),
+        })
+    )
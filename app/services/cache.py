@@ -0,0 +1,78 @@
+import threading
+import time
+
+# ------------------------------------------------------
+# SHORT-TTL SINGLE-FLIGHT CACHE
+# ------------------------------------------------------
+# key -> value for a few seconds. When an entry is missing or stale, the
+# first caller computes it and every concurrent caller for the same key
+# waits for that one result (or exception) instead of running the same
+# aggregate queries again. Per worker process; dashboard numbers a few
+# seconds old are fine, so nothing is invalidated across workers.
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._flights = {}
+
+    def get_or_compute(self, key, compute, ttl_seconds: float = None):
+        """
+        compute() runs at most once per key at a time, on the calling thread.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None:
+                    if len(self._entries) >= self.max_entries:
+                        self._sweep()
+                    ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+                    self._entries[key] = (flight.value, time.monotonic() + ttl)
+                self._flights.pop(key, None)
+            flight.done.set()
+
+        return flight.value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _sweep(self):
+        now = time.monotonic()
+        for key in [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
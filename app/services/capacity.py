@@ -0,0 +1,107 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.database.upsert import upsert
+from app.models.capacity import DeliveryCapacity
+from app.services.units import items_load
+
+# ------------------------------------------------------
+# DELIVERY-DATE CAPACITY
+# ------------------------------------------------------
+# delivery_capacity holds the kitchen load (grams + pieces, the units
+# convert_to_grams produces) already booked for each date. It is adjusted in
+# the same transaction as every status change that books or releases an
+# order, so answering "which dates still fit this cart" is one lookup per
+# date instead of re-reading orders.
+
+BOOKED_STATUSES = {"placed", "confirmed", "inprocess", "dispatched", "delivered", "completed"}
+
+
+def is_booked(status) -> bool:
+    return status in BOOKED_STATUSES
+
+
+def _adjust(db: Session, loads, sign: int):
+    """
+    loads: {delivery_date: (grams, pieces)} — added (sign=1) or released (-1)
+    """
+    rows = [
+        {"delivery_date": d, "booked_grams": sign * g, "booked_pieces": sign * p}
+        for d, (g, p) in loads.items()
+        if d is not None and (g or p)
+    ]
+    upsert(db, DeliveryCapacity, rows, ["delivery_date"], ["booked_grams", "booked_pieces"], increment=True)
+
+
+def _loads(orders):
+    totals = defaultdict(lambda: [0, 0])
+    for delivery_date, items in orders:
+        grams, pieces = items_load(items)
+        totals[delivery_date][0] += grams
+        totals[delivery_date][1] += pieces
+    return totals
+
+
+def order_status_changed(db: Session, order, old_status, new_status):
+    """
+    Call before committing a status change of one order.
+    """
+    if is_booked(old_status) == is_booked(new_status):
+        return
+    sign = 1 if is_booked(new_status) else -1
+    _adjust(db, _loads([(order.delivery_date, order.items)]), sign)
+
+
+def release_orders(db: Session, orders):
+    """
+    orders: [(delivery_date, items)] moving from a booked to a released status.
+    """
+    _adjust(db, _loads(orders), -1)
+
+
+# ------------------------------------------------------
+# AVAILABILITY
+# ------------------------------------------------------
+def earliest_date(lead_time_days: int = 0, today: date = None) -> date:
+    today = today or date.today()
+    return today + timedelta(days=max(get_settings().min_lead_days, lead_time_days or 0))
+
+
+def delivery_slots(db: Session, grams: int, pieces: int, start: date, days: int):
+    """
+    [{date, available, remaining_grams, remaining_pieces}] for start .. start+days-1
+    """
+    settings = get_settings()
+    end = start + timedelta(days=days - 1)
+
+    booked = {
+        row.delivery_date: row
+        for row in db.execute(
+            select(DeliveryCapacity).where(DeliveryCapacity.delivery_date.between(start, end))
+        ).scalars()
+    }
+
+    slots = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = booked.get(day)
+        remaining_grams = settings.daily_capacity_grams - (row.booked_grams if row else 0)
+        remaining_pieces = settings.daily_capacity_pieces - (row.booked_pieces if row else 0)
+        slots.append({
+            "date": day.isoformat(),
+            "available": grams <= remaining_grams and pieces <= remaining_pieces,
+            "remaining_grams": max(remaining_grams, 0),
+            "remaining_pieces": max(remaining_pieces, 0),
+        })
+    return slots
+
+
+def date_available(db: Session, delivery_date: date, items, lead_time_days: int = 0) -> bool:
+    if delivery_date < earliest_date(lead_time_days):
+        return False
+    grams, pieces = items_load(items)
+    return delivery_slots(db, grams, pieces, delivery_date, 1)[0]["available"]
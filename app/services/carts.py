@@ -0,0 +1,336 @@
+import asyncio
+import json
+import threading
+from datetime import datetime
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.upsert import upsert
+from app.models.cart import Cart
+
+try:
+    import redis
+except ImportError:  # optional — only needed for CART_STORE_URL=redis://
+    redis = None
+
+# ------------------------------------------------------
+# SERVER-SIDE CARTS (write-behind)
+# ------------------------------------------------------
+# Cart edits update the store only; dirty carts are written to the `carts`
+# table in batches by `flush()` (every CART_FLUSH_INTERVAL seconds and on
+# shutdown). A cart is {"version": int, "items": [line, ...]} and a line is
+# identified by (id, variant).
+#
+# Backends (CART_STORE_URL):
+#   redis://...  RedisCartBackend — shared by all workers, written behind.
+#   memory://    MemoryCartBackend — per process, written behind. Single
+#                worker / tests only: two workers would each keep their own
+#                copy of a cart and overwrite each other on flush.
+#   (unset)      DatabaseCartBackend — the `carts` table itself is the store;
+#                every edit is a locked read-modify-write, nothing to flush.
+
+MAX_LINES = 100
+MAX_QUANTITY = 99
+
+
+def line_key(line: dict):
+    return str(line.get("id")), str(line.get("variant") or "")
+
+
+def _quantity(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def empty_cart():
+    return {"version": 0, "items": []}
+
+
+class MemoryCartBackend:
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._carts = {}
+        self._dirty = set()
+
+    def _evict(self):
+        # only carts already written to the database can be dropped
+        if len(self._carts) <= self.max_entries:
+            return
+        for user_id in [u for u in self._carts if u not in self._dirty]:
+            del self._carts[user_id]
+            if len(self._carts) <= self.max_entries * 0.9:
+                return
+
+    def get(self, user_id: int):
+        with self._lock:
+            cart = self._carts.get(user_id)
+            return json.loads(json.dumps(cart)) if cart is not None else None
+
+    def load(self, user_id: int, cart: dict):
+        """
+        Cache a cart read from the database (not dirty). Keeps a newer copy.
+        """
+        with self._lock:
+            self._carts.setdefault(user_id, cart)
+            self._evict()
+
+    def update(self, user_id: int, fn):
+        """
+        Atomically cart = fn(cart) and mark it dirty. Returns the new cart.
+        """
+        with self._lock:
+            cart = fn(self._carts.get(user_id) or empty_cart())
+            self._carts[user_id] = cart
+            self._dirty.add(user_id)
+            return json.loads(json.dumps(cart))
+
+    def pop_dirty(self, limit: int):
+        with self._lock:
+            batch = []
+            while self._dirty and len(batch) < limit:
+                user_id = self._dirty.pop()
+                batch.append((user_id, json.loads(json.dumps(self._carts[user_id]))))
+            return batch
+
+    def mark_dirty(self, user_ids):
+        with self._lock:
+            self._dirty.update(u for u in user_ids if u in self._carts)
+
+
+class RedisCartBackend:
+    DIRTY_KEY = "carts:dirty"
+
+    def __init__(self, url: str, ttl_seconds: int = 30 * 24 * 3600):
+        if redis is None:
+            raise RuntimeError("CART_STORE_URL is redis:// but the redis package is not installed")
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, user_id: int):
+        return f"cart:{user_id}"
+
+    def get(self, user_id: int):
+        raw = self.client.get(self._key(user_id))
+        return json.loads(raw) if raw else None
+
+    def load(self, user_id: int, cart: dict):
+        self.client.set(self._key(user_id), json.dumps(cart), ex=self.ttl_seconds, nx=True)
+
+    def update(self, user_id: int, fn):
+        key = self._key(user_id)
+        result = {}
+
+        def transaction(pipe):
+            raw = pipe.get(key)
+            cart = fn(json.loads(raw) if raw else empty_cart())
+            pipe.multi()
+            pipe.set(key, json.dumps(cart), ex=self.ttl_seconds)
+            pipe.sadd(self.DIRTY_KEY, user_id)
+            result["cart"] = cart
+
+        self.client.transaction(transaction, key)
+        return result["cart"]
+
+    def pop_dirty(self, limit: int):
+        user_ids = [int(u) for u in self.client.spop(self.DIRTY_KEY, limit) or []]
+        if not user_ids:
+            return []
+        raws = self.client.mget([self._key(u) for u in user_ids])
+        return [(u, json.loads(raw)) for u, raw in zip(user_ids, raws) if raw]
+
+    def mark_dirty(self, user_ids):
+        if user_ids:
+            self.client.sadd(self.DIRTY_KEY, *user_ids)
+
+
+class DatabaseCartBackend:
+    # reads go straight to the table; CartStore has nothing to preload
+    preload = False
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    def get(self, user_id: int):
+        with self.session_factory() as db:
+            row = db.execute(
+                select(Cart.items, Cart.version).where(Cart.user_id == user_id)
+            ).first()
+        return {"version": row.version, "items": row.items or []} if row else None
+
+    def update(self, user_id: int, fn):
+        with self.session_factory() as db:
+            row = db.execute(
+                select(Cart.items, Cart.version)
+                .where(Cart.user_id == user_id)
+                .with_for_update()
+            ).first()
+            current = {"version": row.version, "items": row.items or []} if row else empty_cart()
+            cart = fn(current)
+            upsert_carts(db, [(user_id, cart)])
+            db.commit()
+        return cart
+
+    def pop_dirty(self, limit: int):
+        return []
+
+    def mark_dirty(self, user_ids):
+        pass
+
+
+# ------------------------------------------------------
+# CART OPERATIONS (pure: cart -> cart)
+# ------------------------------------------------------
+def _clean_line(line: dict, quantity: int):
+    clean = {k: v for k, v in line.items() if k != "op"}
+    clean["quantity"] = min(quantity, MAX_QUANTITY)
+    return clean
+
+
+def apply_ops(cart: dict, ops):
+    """
+    ops: {"op": "set", "id", "variant", "quantity", ...display fields}
+         {"op": "remove", "id", "variant"}
+         {"op": "clear"}
+    `set` with quantity <= 0 removes the line.
+    """
+    lines = {line_key(line): line for line in cart["items"]}
+
+    for op in ops:
+        kind = op.get("op")
+        if kind == "clear":
+            lines = {}
+            continue
+
+        key = line_key(op)
+        quantity = _quantity(op.get("quantity"))
+        if kind == "remove" or (kind == "set" and quantity <= 0):
+            lines.pop(key, None)
+        elif kind == "set":
+            if key not in lines and len(lines) >= MAX_LINES:
+                continue
+            lines[key] = {**lines.get(key, {}), **_clean_line(op, quantity)}
+
+    return {"version": cart["version"] + 1, "items": list(lines.values())}
+
+
+def replace_items(cart: dict, items):
+    ops = [{"op": "clear"}] + [{"op": "set", **item} for item in items if isinstance(item, dict)]
+    return apply_ops(cart, ops)
+
+
+def merge_items(cart: dict, items):
+    """
+    Guest cart -> account cart on login: lines in both keep the larger
+    quantity (the same cart synced twice must not double up).
+    """
+    current = {line_key(line): line for line in cart["items"]}
+    ops = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        existing = current.get(line_key(item))
+        quantity = _quantity(item.get("quantity"))
+        if existing is not None:
+            quantity = max(quantity, _quantity(existing.get("quantity")))
+        ops.append({"op": "set", **item, "quantity": quantity})
+    return apply_ops(cart, ops)
+
+
+# ------------------------------------------------------
+# STORE
+# ------------------------------------------------------
+class CartStore:
+    def __init__(self, backend=None, batch_size: int = 500):
+        self.backend = backend or MemoryCartBackend()
+        self.batch_size = batch_size
+
+    def _ensure_loaded(self, db: Session, user_id: int):
+        if not getattr(self.backend, "preload", True) or self.backend.get(user_id) is not None:
+            return
+        row = db.execute(
+            select(Cart.items, Cart.version).where(Cart.user_id == user_id)
+        ).first()
+        cart = {"version": row.version, "items": row.items or []} if row else empty_cart()
+        self.backend.load(user_id, cart)
+
+    def get(self, db: Session, user_id: int):
+        self._ensure_loaded(db, user_id)
+        return self.backend.get(user_id) or empty_cart()
+
+    def apply(self, db: Session, user_id: int, ops):
+        self._ensure_loaded(db, user_id)
+        return self.backend.update(user_id, lambda cart: apply_ops(cart, ops))
+
+    def replace(self, db: Session, user_id: int, items):
+        self._ensure_loaded(db, user_id)
+        return self.backend.update(user_id, lambda cart: replace_items(cart, items))
+
+    def merge(self, db: Session, user_id: int, items):
+        self._ensure_loaded(db, user_id)
+        return self.backend.update(user_id, lambda cart: merge_items(cart, items))
+
+    def clear(self, db: Session, user_id: int):
+        return self.apply(db, user_id, [{"op": "clear"}])
+
+    # ---------------- write-behind ----------------
+    def flush(self, db: Session) -> int:
+        """
+        Write every dirty cart, `batch_size` rows per statement.
+        """
+        written = 0
+        while True:
+            batch = self.backend.pop_dirty(self.batch_size)
+            if not batch:
+                return written
+            try:
+                upsert_carts(db, batch)
+                db.commit()
+            except Exception:
+                db.rollback()
+                self.backend.mark_dirty([user_id for user_id, _ in batch])
+                raise
+            written += len(batch)
+
+
+def upsert_carts(db: Session, batch):
+    now = datetime.utcnow()
+    rows = [
+        {"user_id": user_id, "items": cart["items"], "version": cart["version"], "updated_at": now}
+        for user_id, cart in batch
+    ]
+    upsert(db, Cart, rows, ["user_id"], ["items", "version", "updated_at"])
+
+
+# ------------------------------------------------------
+# FLUSH LOOP (started from the app lifespan)
+# ------------------------------------------------------
+async def flush_periodically(store: CartStore, session_factory, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        await run_in_threadpool(flush_now, store, session_factory)
+
+
+def flush_now(store: CartStore, session_factory):
+    try:
+        with session_factory() as db:
+            written = store.flush(db)
+        if written:
+            print(f"🛒 flushed {written} carts")
+    except Exception as e:
+        print("⚠️ cart flush failed:", e)
+
+
+def backend_from_url(url: str = None, session_factory=None):
+    if url and url.startswith(("redis://", "rediss://")):
+        return RedisCartBackend(url)
+    if url == "memory://" or session_factory is None:
+        return MemoryCartBackend()
+    return DatabaseCartBackend(session_factory)
+
+
+cart_store = CartStore()
@@ -0,0 +1,119 @@
+import threading
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import session as database
+from app.models.product import Product
+from app.services.images import image_set
+from app.services.invalidation import bus
+
+# ------------------------------------------------------
+# IN-MEMORY CATALOG SNAPSHOT
+# ------------------------------------------------------
+# The catalog is small (hundreds of rows) and read far more often than it
+# is written, so derived indexes (search, ...) are built from one shared
+# snapshot and rebuilt lazily after `catalog_changed()` bumps the version.
+# Other workers hear about the change over the invalidation bus.
+
+CATALOG_COLUMNS = [
+    "id",
+    "item_name",
+    "category",
+    "description",
+    "imagesrc",
+    "image_variants",
+    "shelf_life_days",
+    "lead_time_days",
+    "packing_01",
+    "price_01",
+    "packing_02",
+    "price_02",
+    "packing_03",
+    "price_03",
+    "packing_04",
+    "price_04",
+    "is_enabled",
+]
+
+_lock = threading.Lock()
+_version = 0
+_rows = None
+
+
+def catalog_version() -> int:
+    return _version
+
+
+def get_catalog(db: Session):
+    """
+    Return (version, rows) — rows are plain dicts for ALL products
+    (enabled + disabled). Loaded once per catalog version.
+    """
+    global _rows
+
+    with _lock:
+        if _rows is None:
+            if database.is_replica(db):
+                # a lagging replica would pin pre-write rows to the new version
+                with database.SessionLocal() as primary:
+                    _rows = _load(primary)
+            else:
+                _rows = _load(db)
+        return _version, _rows
+
+
+def _load(db: Session):
+    columns = [getattr(Product, c) for c in CATALOG_COLUMNS]
+    return [
+        dict(r)
+        for r in db.execute(select(*columns).order_by(Product.id)).mappings()
+    ]
+
+
+def _reset(key=None):
+    global _rows, _version
+
+    with _lock:
+        _rows = None
+        _version += 1
+
+
+def catalog_changed(product_id=None):
+    """
+    Call after any product write (add / update / delete / toggle / import).
+    """
+    _reset()
+    bus.publish("catalog", product_id)
+
+
+bus.subscribe("catalog", _reset)
+
+
+# ------------------------------------------------------
+# SERIALIZERS
+# ------------------------------------------------------
+def product_variants(row: dict):
+    variants = []
+    for i in range(1, 5):
+        price = row.get(f"price_0{i}")
+        if price:
+            variants.append({"packing": row.get(f"packing_0{i}") or f"Var {i}", "price": price})
+    return variants
+
+
+def public_product(row: dict):
+    """
+    Same shape as the public `/api/products` listing.
+    """
+    variants = product_variants(row)
+    return {
+        "id": row["id"],
+        "item_name": row["item_name"],
+        "category": row["category"],
+        "description": row["description"],
+        "image_url": row["imagesrc"],
+        "images": image_set(row["imagesrc"], row.get("image_variants")),
+        "variants": variants,
+        "max_price": max((v["price"] for v in variants), default=0),
+    }
@@ -0,0 +1,99 @@
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.services.catalog import get_catalog, catalog_version, public_product, product_variants
+
+# ------------------------------------------------------
+# CATEGORY FACET INDEX
+# ------------------------------------------------------
+# category key (lower-cased) -> enabled products, counts and price range.
+# Built from the shared catalog snapshot, so it is rebuilt only after
+# `catalog_changed()`.
+
+
+class CategoryIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self.categories = {}
+
+    def build(self, rows):
+        categories = {}
+
+        for row in rows:
+            name = (row.get("category") or "").strip()
+            if not name:
+                continue
+
+            entry = categories.setdefault(name.lower(), {
+                "name": name,
+                "product_ids": [],
+                "products": [],
+                "count": 0,
+                "total": 0,
+                "min_price": None,
+                "max_price": None,
+            })
+            entry["total"] += 1
+
+            if not row.get("is_enabled"):
+                continue
+
+            entry["count"] += 1
+            entry["product_ids"].append(row["id"])
+            entry["products"].append(public_product(row))
+
+            for v in product_variants(row):
+                price = float(v["price"])
+                if entry["min_price"] is None or price < entry["min_price"]:
+                    entry["min_price"] = price
+                if entry["max_price"] is None or price > entry["max_price"]:
+                    entry["max_price"] = price
+
+        self.categories = categories
+
+    def ensure_current(self, db: Session):
+        if self._version == catalog_version():
+            return
+        with self._lock:
+            version, rows = get_catalog(db)
+            if self._version != version:
+                self.build(rows)
+                self._version = version
+
+    def products(self, category: str):
+        entry = self.categories.get((category or "").strip().lower())
+        return entry["products"] if entry else []
+
+    def facets(self):
+        return sorted(
+            (
+                {
+                    "name": e["name"],
+                    "count": e["count"],
+                    "min_price": e["min_price"],
+                    "max_price": e["max_price"],
+                }
+                for e in self.categories.values()
+                if e["count"]
+            ),
+            key=lambda f: f["name"].lower(),
+        )
+
+    def totals(self):
+        """
+        All products (enabled + disabled) per category — admin dashboard.
+        """
+        return [
+            {"name": e["name"], "value": e["total"]}
+            for e in self.categories.values()
+        ]
+
+
+category_index = CategoryIndex()
+
+
+def get_category_index(db: Session) -> CategoryIndex:
+    category_index.ensure_current(db)
+    return category_index
@@ -0,0 +1,43 @@
+from functools import lru_cache
+
+from fastapi import HTTPException
+
+from app.core.config import get_settings
+from app.services.gateway_stub import StubRazorpayClient, SignatureVerificationError as StubSignatureError
+
+# ------------------------------------------------------
+# RAZORPAY CLIENT
+# ------------------------------------------------------
+
+
+@lru_cache
+def get_razorpay_client():
+    """
+    Built on first use so workers boot without importing the SDK;
+    missing keys fail the payment request instead of the whole app.
+    """
+    settings = get_settings()
+    if settings.razorpay_stub:
+        print("⚠️ RAZORPAY_STUB=1 — using the local gateway stub, no real payments")
+        return StubRazorpayClient()
+
+    if not settings.razorpay_configured:
+        raise HTTPException(status_code=503, detail="Razorpay keys not configured")
+
+    import razorpay
+
+    return razorpay.Client(
+        auth=(settings.razorpay_key_id, settings.razorpay_key_secret)
+    )
+
+
+def signature_error(client):
+    """
+    Exception class client.utility.verify_payment_signature raises.
+    """
+    if isinstance(client, StubRazorpayClient):
+        return StubSignatureError
+
+    import razorpay
+
+    return razorpay.errors.SignatureVerificationError
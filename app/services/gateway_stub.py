@@ -0,0 +1,105 @@
+import hashlib
+import hmac
+import time
+import uuid
+
+# ------------------------------------------------------
+# LOCAL RAZORPAY STUB (RAZORPAY_STUB=1)
+# ------------------------------------------------------
+# In-memory stand-in for the parts of razorpay.Client this app uses:
+# order.create / order.fetch, payment.all and
+# utility.verify_payment_signature. For local runs and tests only —
+# nothing is charged and every worker has its own stub.
+
+
+class SignatureVerificationError(Exception):
+    pass
+
+
+class _Orders:
+    def __init__(self, stub):
+        self._stub = stub
+
+    def create(self, data: dict):
+        order = {
+            "id": f"order_stub{uuid.uuid4().hex[:14]}",
+            "amount": data.get("amount"),
+            "currency": data.get("currency", "INR"),
+            "status": "created",
+            "created_at": int(time.time()),
+        }
+        self._stub.orders[order["id"]] = order
+        return order
+
+    def fetch(self, order_id: str):
+        return self._stub.orders[order_id]
+
+
+class _Payments:
+    def __init__(self, stub):
+        self._stub = stub
+
+    def all(self, params: dict = None):
+        """
+        Same paging as the real API: from / to (unix seconds), count (max 100), skip.
+        """
+        params = params or {}
+        start = params.get("from", 0)
+        end = params.get("to", float("inf"))
+        count = min(int(params.get("count", 10)), 100)
+        skip = int(params.get("skip", 0))
+
+        matching = [
+            p for p in reversed(self._stub.payments)
+            if start <= p["created_at"] <= end
+        ]
+        items = matching[skip:skip + count]
+        return {"entity": "collection", "count": len(items), "items": items}
+
+
+class _Utility:
+    def __init__(self, stub):
+        self._stub = stub
+
+    def verify_payment_signature(self, params: dict):
+        expected = self._stub.sign(params["razorpay_order_id"], params["razorpay_payment_id"])
+        if not hmac.compare_digest(expected, params["razorpay_signature"]):
+            raise SignatureVerificationError("Razorpay Signature Verification Failed")
+        return True
+
+
+class StubRazorpayClient:
+    def __init__(self, key_secret: str = "stub_secret"):
+        self.key_secret = key_secret
+        self.orders = {}
+        self.payments = []
+        self.order = _Orders(self)
+        self.payment = _Payments(self)
+        self.utility = _Utility(self)
+
+    def sign(self, order_id: str, payment_id: str) -> str:
+        message = f"{order_id}|{payment_id}".encode()
+        return hmac.new(self.key_secret.encode(), message, hashlib.sha256).hexdigest()
+
+    def capture(self, order_id: str, status: str = "captured"):
+        """
+        Simulate the customer paying for `order_id` (no webhook is sent).
+        Returns what checkout.js would post to /verify-payment/.
+        """
+        order = self.orders.get(order_id, {})
+        payment = {
+            "id": f"pay_stub{uuid.uuid4().hex[:14]}",
+            "entity": "payment",
+            "order_id": order_id,
+            "amount": order.get("amount"),
+            "status": status,
+            "created_at": int(time.time()),
+        }
+        self.payments.append(payment)
+        if status == "captured" and order:
+            order["status"] = "paid"
+        return {
+            "order_id": order_id,
+            "payment_id": payment["id"],
+            "signature": self.sign(order_id, payment["id"]),
+        }
@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+import json
+import time
+
+# ------------------------------------------------------
+# SHORT-LIVED IDEMPOTENCY STORE
+# ------------------------------------------------------
+# key -> value with a TTL, plus one asyncio.Lock per key so concurrent
+# requests carrying the same key (double clicks) run one at a time.
+
+
+class IdempotencyStore:
+    def __init__(self, ttl_seconds: int = 900, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = {}
+        self._locks = {}
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def put(self, key: str, value, ttl_seconds: int = None):
+        if len(self._entries) >= self.max_entries:
+            self.sweep()
+        self._entries[key] = (value, time.monotonic() + (ttl_seconds or self.ttl_seconds))
+
+    def forget(self, key: str):
+        self._entries.pop(key, None)
+
+    def lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def sweep(self):
+        now = time.monotonic()
+        for key in [k for k, (_, exp) in self._entries.items() if exp < now]:
+            self._entries.pop(key, None)
+        for key in [k for k, lock in self._locks.items() if not lock.locked() and k not in self._entries]:
+            self._locks.pop(key, None)
+
+
+def cart_fingerprint(user_id: int, items, address, delivery_date, amount) -> str:
+    """
+    Stable hash of "this user checking out this cart" — used as the
+    idempotency key when the client doesn't send one.
+    """
+    lines = sorted(
+        (
+            {
+                "id": i.get("id"),
+                "variant": i.get("variant"),
+                "quantity": i.get("quantity"),
+                "price": i.get("price"),
+            }
+            for i in (items or [])
+            if isinstance(i, dict)
+        ),
+        key=lambda i: (str(i["id"]), str(i["variant"])),
+    )
+    payload = json.dumps(
+        {
+            "user": user_id,
+            "items": lines,
+            "address": address,
+            "delivery_date": delivery_date,
+            "amount": amount,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
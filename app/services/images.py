@@ -0,0 +1,130 @@
+import io
+import os
+from functools import lru_cache
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional — originals are stored without derivatives
+    Image = None
+
+# ------------------------------------------------------
+# DERIVATIVE SIZES (max width in px)
+# ------------------------------------------------------
+DERIVATIVES = {
+    "thumbnail": 200,
+    "card": 480,
+    "detail": 1080,
+}
+FORMATS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+UPLOAD_FOLDER = "my_uploads"
+
+
+# ------------------------------------------------------
+# STORAGE (Cloudinary)
+# ------------------------------------------------------
+@lru_cache
+def cloudinary_uploader():
+    """
+    Imported + configured on first upload, not at worker start.
+    """
+    import cloudinary
+    import cloudinary.uploader
+
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    cloudinary.config(
+        cloud_name=settings.cloudinary_cloud_name,
+        api_key=settings.cloudinary_api_key,
+        api_secret=settings.cloudinary_api_secret,
+        secure=True,
+    )
+    return cloudinary.uploader
+
+
+def store_image(data: bytes, public_id: str = None, folder: str = UPLOAD_FOLDER) -> str:
+    options = {"folder": folder, "resource_type": "image"}
+    if public_id:
+        options.update(public_id=public_id, overwrite=True)
+    result = cloudinary_uploader().upload(io.BytesIO(data), **options)
+    return result["secure_url"]
+
+
+# ------------------------------------------------------
+# RESIZING
+# ------------------------------------------------------
+def generate_derivatives(data: bytes):
+    """
+    Yield (size_name, format, width, height, bytes) for every size x format.
+    Never upscales: small originals keep their own width.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        for name, max_width in DERIVATIVES.items():
+            width = min(max_width, image.width)
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+
+            for fmt, options in FORMATS.items():
+                frame = resized
+                if fmt == "jpeg" and frame.mode == "RGBA":
+                    # JPEG has no alpha — flatten onto white
+                    background = Image.new("RGB", frame.size, (255, 255, 255))
+                    background.paste(frame, mask=frame.split()[3])
+                    frame = background
+
+                out = io.BytesIO()
+                frame.save(out, **options)
+                yield name, fmt, width, height, out.getvalue()
+
+
+def process_upload(data: bytes):
+    """
+    Store the original plus resized WebP/JPEG derivatives.
+    Returns (original_url, image_variants | None) — a failed derivative
+    never loses the original, the product just falls back to it.
+    """
+    original_url = store_image(data)
+
+    if Image is None:
+        return original_url, None
+
+    stem = os.path.splitext(os.path.basename(original_url))[0]
+    variants = {}
+    try:
+        for name, fmt, width, height, body in generate_derivatives(data):
+            entry = variants.setdefault(name, {"width": width, "height": height})
+            entry[fmt] = store_image(body, public_id=f"{stem}_{name}_{fmt}")
+    except Exception as e:
+        print("⚠️ image derivatives failed, keeping the original only:", e)
+        return original_url, None
+
+    return original_url, variants
+
+
+# ------------------------------------------------------
+# API SHAPE
+# ------------------------------------------------------
+def image_set(imagesrc: str, variants: dict = None):
+    """
+    srcset-ready image URLs for catalog responses:
+    {"src": ..., "thumbnail": {...}, "srcset_webp": "u 200w, ...", "srcset_jpeg": ...}
+    """
+    images = {"src": imagesrc}
+    if not variants:
+        return images
+
+    ordered = sorted(variants.items(), key=lambda kv: kv[1].get("width", 0))
+    for name, entry in ordered:
+        images[name] = entry
+    for fmt in FORMATS:
+        images[f"srcset_{fmt}"] = ", ".join(
+            f"{entry[fmt]} {entry['width']}w" for _, entry in ordered if entry.get(fmt)
+        )
+    return images
@@ -0,0 +1,197 @@
+import glob
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+try:
+    import redis
+except ImportError:  # optional — only needed for the redis:// transport
+    redis = None
+
+# ------------------------------------------------------
+# CROSS-WORKER INVALIDATION BUS
+# ------------------------------------------------------
+# Every uvicorn worker keeps its own in-process caches (catalog snapshot and
+# the indexes built from it, ...). A write handled by one worker publishes
+# {"topic", "key"} here; every OTHER worker runs the handlers subscribed to
+# that topic. The publishing worker invalidates its own copy directly.
+#
+#   INVALIDATION_URL=redis://host:6379/0    Redis pub/sub (production)
+#   INVALIDATION_URL=unix:///tmp/orderms    unix datagram sockets, one per
+#                                           worker (single host / tests)
+#   (unset)                                 single worker — nothing to send
+
+CHANNEL = "orderms:invalidate"
+
+
+class NullTransport:
+    def start(self, deliver):
+        pass
+
+    def send(self, data: bytes):
+        pass
+
+    def stop(self):
+        pass
+
+
+class LocalSocketTransport:
+    """
+    One SOCK_DGRAM socket per process in a shared directory; send() fans a
+    datagram out to every other socket there and unlinks dead ones.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        self._sock = None
+        self._thread = None
+
+    def start(self, deliver):
+        os.makedirs(self.directory, exist_ok=True)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._thread = threading.Thread(target=self._listen, args=(deliver,), daemon=True)
+        self._thread.start()
+
+    def _listen(self, deliver):
+        while True:
+            try:
+                data = self._sock.recv(65536)
+            except OSError:
+                return  # socket closed by stop()
+            deliver(data)
+
+    def send(self, data: bytes):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as out:
+            for path in glob.glob(os.path.join(self.directory, "*.sock")):
+                if path == self.path:
+                    continue
+                try:
+                    out.sendto(data, path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # worker exited without cleaning up
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+
+    def stop(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class RedisTransport:
+    RETRY_SECONDS = 1.0
+
+    def __init__(self, url: str, channel: str = CHANNEL):
+        if redis is None:
+            raise RuntimeError("INVALIDATION_URL is redis:// but the redis package is not installed")
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self._pubsub = None
+        self._thread = None
+        self._handler = None
+
+    def start(self, deliver):
+        self._handler = lambda message: deliver(message["data"])
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.channel: self._handler})
+        self._thread = self._pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=self._listener_failed
+        )
+
+    def _listener_failed(self, error, pubsub, thread):
+        """
+        Without this a dropped connection ends the listener thread and the
+        worker silently stops hearing invalidations. Log, back off, and
+        subscribe again; the thread keeps polling.
+        """
+        print("⚠️ invalidation listener error, resubscribing:", error)
+        time.sleep(self.RETRY_SECONDS)
+        try:
+            pubsub.subscribe(**{self.channel: self._handler})
+        except Exception as e:
+            print("⚠️ invalidation resubscribe failed:", e)
+
+    def send(self, data: bytes):
+        self.client.publish(self.channel, data)
+
+    def stop(self):
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+
+def transport_from_url(url: str = None):
+    if not url:
+        return NullTransport()
+    if url.startswith(("redis://", "rediss://", "unix+redis://")):
+        return RedisTransport(url)
+    if url.startswith("unix://"):
+        return LocalSocketTransport(url[len("unix://"):])
+    raise ValueError(f"Unsupported INVALIDATION_URL: {url}")
+
+
+class InvalidationBus:
+    def __init__(self, transport=None):
+        self.transport = transport or NullTransport()
+        self.origin = uuid.uuid4().hex
+        self._handlers = defaultdict(list)
+        self._started = False
+
+    def subscribe(self, topic: str, handler):
+        """
+        handler(key) runs on the transport's listener thread.
+        """
+        self._handlers[topic].append(handler)
+
+    def publish(self, topic: str, key=None):
+        if not self._started:
+            return
+        message = {"topic": topic, "key": key, "origin": self.origin}
+        try:
+            self.transport.send(json.dumps(message, default=str).encode())
+        except Exception as e:
+            # a missed invalidation must never fail the write that caused it
+            print("⚠️ invalidation publish failed:", topic, key, e)
+
+    def deliver(self, data: bytes):
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self.origin:
+            return
+
+        for handler in self._handlers.get(message.get("topic"), ()):
+            try:
+                handler(message.get("key"))
+            except Exception as e:
+                print("⚠️ invalidation handler failed:", message.get("topic"), e)
+
+    def start(self, transport=None):
+        if transport is not None:
+            self.transport = transport
+        self.transport.start(self.deliver)
+        self._started = True
+
+    def stop(self):
+        self._started = False
+        self.transport.stop()
+
+
+# one bus per worker process — started / stopped by the app lifespan
+bus = InvalidationBus()
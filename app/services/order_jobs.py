@@ -0,0 +1,151 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.orders import Order
+from app.services.archive import archive_orders
+from app.services.capacity import order_status_changed
+from app.services.carts import cart_store
+from app.services.gateway import get_razorpay_client
+
+# ------------------------------------------------------
+# ORDER HOUSEKEEPING JOBS (run by app.services.scheduler)
+# ------------------------------------------------------
+# expire_pending_orders    abandoned checkouts: pending -> expired
+# reconcile_pending_orders pending orders the gateway says were paid (missed
+#                          webhook / closed tab) -> placed
+# archive_orders           finished orders -> orders_archive (app.services.archive)
+# Both walk ix_orders_order_status_created_at. The expiry TTL must be longer
+# than the reconcile window, so a paid order is reconciled before it can
+# expire.
+
+BATCH_SIZE = 500
+MAX_BATCHES = 20          # per run — keeps each run (and its locks) short
+MIN_PENDING_AGE = 120     # seconds — leave checkouts in progress alone
+PAYMENTS_PAGE = 100       # gateway maximum
+MAX_PAYMENT_PAGES = 50
+
+
+def expire_pending_orders(db: Session, ttl_minutes: int):
+    now = datetime.utcnow()
+    cutoff = now - timedelta(minutes=ttl_minutes)
+    expired = 0
+
+    for _ in range(MAX_BATCHES):
+        ids = [
+            order_id for (order_id,) in db.query(Order.id)
+            .filter(Order.order_status == "pending", Order.created_at < cutoff)
+            .order_by(Order.created_at)
+            .limit(BATCH_SIZE)
+        ]
+        if not ids:
+            break
+
+        expired += db.execute(
+            update(Order)
+            .where(Order.id.in_(ids), Order.order_status == "pending")
+            .values(order_status="expired", updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+
+        if len(ids) < BATCH_SIZE:
+            break
+
+    return {"expired": expired}
+
+
+def captured_payments(client, since_ts: int, until_ts: int):
+    """
+    {razorpay_order_id: payment_id} for payments captured in the window,
+    paged through payment.all (one call per 100 payments, not per order).
+    """
+    captured = {}
+    for page in range(MAX_PAYMENT_PAGES):
+        batch = client.payment.all({
+            "from": since_ts,
+            "to": until_ts,
+            "count": PAYMENTS_PAGE,
+            "skip": page * PAYMENTS_PAGE,
+        }).get("items", [])
+
+        for payment in batch:
+            if payment.get("status") == "captured" and payment.get("order_id"):
+                captured[payment["order_id"]] = payment["id"]
+        if len(batch) < PAYMENTS_PAGE:
+            break
+    return captured
+
+
+def reconcile_pending_orders(db: Session, window_minutes: int, client=None):
+    now = datetime.utcnow()
+    pending = dict(
+        db.query(Order.razorpay_order_id, Order.id)
+        .filter(
+            Order.order_status == "pending",
+            Order.created_at >= now - timedelta(minutes=window_minutes),
+            Order.created_at < now - timedelta(seconds=MIN_PENDING_AGE),
+            Order.razorpay_order_id.isnot(None),
+        )
+        .all()
+    )
+    if not pending:
+        return {"checked": 0, "placed": 0}
+
+    client = client or get_razorpay_client()
+    until_ts = int(time.time())
+    # payments can be made a little after the order was created
+    since_ts = until_ts - window_minutes * 60
+    paid = {
+        order_id: payment_id
+        for order_id, payment_id in captured_payments(client, since_ts, until_ts).items()
+        if order_id in pending
+    }
+    if not paid:
+        return {"checked": len(pending), "placed": 0}
+
+    # same transition as verify-payment / the webhook, rows locked against both
+    orders = (
+        db.query(Order)
+        .filter(Order.id.in_([pending[o] for o in paid]), Order.order_status == "pending")
+        .with_for_update()
+        .all()
+    )
+    for order in orders:
+        order_status_changed(db, order, order.order_status, "placed")
+        order.order_status = "placed"
+        order.razorpay_payment_id = paid[order.razorpay_order_id]
+        order.updated_at = now
+    db.commit()
+
+    for order in orders:
+        cart_store.clear(db, order.user_id)
+        print(f"✅ Order {order.id} marked as PLACED by reconciliation")
+
+    return {"checked": len(pending), "placed": len(orders)}
+
+
+def register_order_jobs(scheduler, settings):
+    if settings.pending_order_ttl_minutes <= settings.reconcile_window_minutes:
+        print("⚠️ PENDING_ORDER_TTL_MINUTES should exceed RECONCILE_WINDOW_MINUTES")
+
+    # reconcile first: jobs due on the same tick run in this order
+    if settings.razorpay_configured or settings.razorpay_stub:
+        scheduler.add(
+            "reconcile_pending_orders",
+            settings.reconcile_interval,
+            lambda db: reconcile_pending_orders(db, settings.reconcile_window_minutes),
+        )
+    scheduler.add(
+        "expire_pending_orders",
+        settings.expire_pending_interval,
+        lambda db: expire_pending_orders(db, settings.pending_order_ttl_minutes),
+    )
+    if settings.order_archive_after_days > 0:
+        scheduler.add(
+            "archive_orders",
+            settings.archive_interval,
+            lambda db: archive_orders(db, settings.order_archive_after_days),
+        )
@@ -0,0 +1,27 @@
+import re
+
+# ------------------------------------------------------
+# 📞 PHONE NUMBERS
+# ------------------------------------------------------
+# users.mobile_number / orders.mobile_number hold the bare 10-digit mobile
+# ("9876543210"), so "+91 98765 43210", "09876543210" and "9876543210" all
+# hit the same index entry on login, registration and admin search.
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(raw) -> str:
+    """
+    "+91 98765-43210" -> "9876543210". Also used for search prefixes
+    ("+91 987" -> "987"), so it never pads or validates length.
+    """
+    if raw is None:
+        return ""
+    text = str(raw).strip()
+    digits = _NON_DIGITS.sub("", text)
+
+    if text.startswith("+91") or (len(digits) > 10 and digits.startswith("91")):
+        digits = digits[2:]
+    elif len(digits) == 11 and digits.startswith("0"):
+        digits = digits[1:]
+    return digits
@@ -0,0 +1,164 @@
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.services.catalog import get_catalog, catalog_version
+
+# ------------------------------------------------------
+# PRICING RULES (mirror static/js/cart.js calculatePricing)
+# ------------------------------------------------------
+DELIVERY_CHARGE = get_settings().delivery_charge
+FREE_DELIVERY_THRESHOLD = get_settings().free_delivery_threshold
+
+# Labels the different product endpoints show for a slot with no packing,
+# so carts built from any of them still resolve to a price.
+FALLBACK_LABELS = {
+    1: ("var 1", "200", "250gm"),
+    2: ("var 2", "500", "500gm"),
+    3: ("var 3", "1000", "1kg"),
+    4: ("var 4", "1500", "2kg"),
+}
+
+
+def packing_key(packing) -> str:
+    return str(packing or "").replace(" ", "").lower()
+
+
+# ------------------------------------------------------
+# PRICE INDEX
+# ------------------------------------------------------
+class PriceIndex:
+    """
+    (product_id, packing) -> price, plus product_id -> enabled / name /
+    default packing. Rebuilt from the catalog snapshot after catalog_changed().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self.prices = {}
+        self.products = {}
+
+    def build(self, rows):
+        prices = {}
+        products = {}
+
+        for row in rows:
+            pid = row["id"]
+            default = None
+
+            for i in range(1, 5):
+                price = row.get(f"price_0{i}")
+                if not price:
+                    continue
+
+                packing = row.get(f"packing_0{i}")
+                labels = (packing,) if packing else FALLBACK_LABELS[i]
+                for label in labels:
+                    prices.setdefault((pid, packing_key(label)), float(price))
+                if default is None:
+                    default = packing or FALLBACK_LABELS[i][0]
+
+            products[pid] = {
+                "name": row["item_name"],
+                "enabled": bool(row.get("is_enabled")),
+                "default_packing": default,
+                "lead_time_days": row.get("lead_time_days") or 0,
+            }
+
+        self.prices = prices
+        self.products = products
+
+    def ensure_current(self, db: Session):
+        if self._version == catalog_version():
+            return
+        with self._lock:
+            version, rows = get_catalog(db)
+            if self._version != version:
+                self.build(rows)
+                self._version = version
+
+    def price_line(self, product_id, variant, quantity):
+        product = self.products.get(product_id)
+        if product is None:
+            return None, "Product not found"
+        if not product["enabled"]:
+            return None, "Product is unavailable"
+        if quantity is None or quantity <= 0:
+            return None, "Invalid quantity"
+
+        price = self.prices.get((product_id, packing_key(variant or product["default_packing"])))
+        if price is None:
+            return None, f"Unknown variant '{variant}'"
+        return price, None
+
+    def lead_time_days(self, items) -> int:
+        """
+        Longest preparation lead time among the cart's products.
+        """
+        days = 0
+        for item in items or []:
+            try:
+                product = self.products.get(int(item.get("id")))
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if product:
+                days = max(days, product["lead_time_days"])
+        return days
+
+    def price_cart(self, items):
+        """
+        Reprice a whole cart in O(items) dictionary lookups.
+        """
+        lines = []
+        unavailable = []
+        subtotal = 0.0
+
+        for item in items:
+            if not isinstance(item, dict):
+                unavailable.append({"id": None, "variant": None, "error": "Invalid item"})
+                continue
+
+            product_id = item.get("id")
+            variant = item.get("variant")
+            try:
+                product_id = int(product_id)
+                quantity = int(item.get("quantity", 0))
+            except (TypeError, ValueError):
+                product_id, quantity = None, 0
+
+            price, error = self.price_line(product_id, variant, quantity)
+            if error:
+                unavailable.append({"id": item.get("id"), "variant": variant, "error": error})
+                continue
+
+            line_total = round(price * quantity, 2)
+            subtotal += line_total
+            lines.append({
+                "id": product_id,
+                "name": self.products[product_id]["name"],
+                "variant": variant or self.products[product_id]["default_packing"],
+                "quantity": quantity,
+                "price": price,
+                "line_total": line_total,
+            })
+
+        subtotal = round(subtotal, 2)
+        shipping = 0.0 if not lines or subtotal > FREE_DELIVERY_THRESHOLD else DELIVERY_CHARGE
+
+        return {
+            "items": lines,
+            "unavailable": unavailable,
+            "subtotal": subtotal,
+            "shipping": shipping,
+            "total": round(subtotal + shipping, 2),
+        }
+
+
+price_index = PriceIndex()
+
+
+def get_price_index(db: Session) -> PriceIndex:
+    price_index.ensure_current(db)
+    return price_index
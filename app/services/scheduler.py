@@ -0,0 +1,158 @@
+import asyncio
+import time
+from datetime import datetime
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+# ------------------------------------------------------
+# IN-PROCESS JOB SCHEDULER (one leader across workers)
+# ------------------------------------------------------
+# Every worker runs the loop from the app lifespan, but only the worker
+# holding the database lock runs jobs. On MySQL that is GET_LOCK() on a
+# connection the leader keeps open. If the leader dies, its connection
+# closes, the lock is freed, and another worker takes over on its next
+# tick. Other dialects (SQLite in dev) have no named locks, so every
+# process leads.
+
+
+class DbLeaderLock:
+    def __init__(self, engine, name: str = "orderms:scheduler"):
+        self.engine = engine
+        self.name = name
+        self._conn = None
+
+    def acquire(self) -> bool:
+        """
+        Non-blocking. True while this process holds the lock.
+        """
+        if self.engine.dialect.name != "mysql":
+            return True
+
+        if self._conn is not None:
+            try:
+                held = self._conn.execute(
+                    text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {"name": self.name}
+                ).scalar()
+                if held:
+                    return True
+            except Exception as e:
+                print("⚠️ scheduler lock connection lost:", e)
+            self._close()
+
+        conn = self.engine.connect()
+        try:
+            got = conn.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": self.name}).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if got == 1:
+            self._conn = conn
+            return True
+        conn.close()
+        return False
+
+    def release(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": self.name})
+        except Exception:
+            pass
+        self._close()
+
+    def _close(self):
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+class Job:
+    def __init__(self, name: str, interval: float, fn):
+        self.name = name
+        self.interval = interval
+        self.fn = fn  # fn(db) -> dict of counts for the metrics
+        self.next_run = 0.0
+        self.runs = 0
+        self.failures = 0
+        self.last_started_at = None
+        self.last_duration_ms = None
+        self.last_result = None
+        self.last_error = None
+
+    def metrics(self):
+        return {
+            "interval_seconds": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_started_at": self.last_started_at,
+            "last_duration_ms": self.last_duration_ms,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+class Scheduler:
+    def __init__(self, tick_seconds: float = 15):
+        self.tick_seconds = tick_seconds
+        self.session_factory = None
+        self.lock = None
+        self.jobs = {}
+        self.is_leader = False
+
+    def add(self, name: str, interval: float, fn):
+        self.jobs[name] = Job(name, interval, fn)
+
+    def run_job(self, job: Job):
+        job.last_started_at = datetime.utcnow().isoformat()
+        start = time.perf_counter()
+        try:
+            with self.session_factory() as db:
+                job.last_result = job.fn(db)
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            print(f"⚠️ job {job.name} failed:", e)
+        finally:
+            job.runs += 1
+            job.last_duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            job.next_run = time.monotonic() + job.interval
+
+    def run_due(self):
+        now = time.monotonic()
+        for job in self.jobs.values():
+            if job.next_run <= now:
+                self.run_job(job)
+
+    async def run_forever(self, session_factory, lock):
+        self.session_factory = session_factory
+        self.lock = lock
+        while True:
+            try:
+                leader = await run_in_threadpool(self.lock.acquire)
+                if leader != self.is_leader:
+                    print("⏱️ scheduler leader" if leader else "⏱️ scheduler follower")
+                self.is_leader = leader
+                if leader:
+                    await run_in_threadpool(self.run_due)
+            except Exception as e:
+                print("⚠️ scheduler tick failed:", e)
+            await asyncio.sleep(self.tick_seconds)
+
+    def stop(self):
+        if self.lock is not None:
+            self.lock.release()
+        self.is_leader = False
+
+    def metrics(self):
+        return {
+            "is_leader": self.is_leader,
+            "jobs": {name: job.metrics() for name, job in self.jobs.items()},
+        }
+
+
+# one per worker process — jobs registered and loop started by the app lifespan
+scheduler = Scheduler()
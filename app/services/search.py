@@ -0,0 +1,246 @@
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+from sqlalchemy.orm import Session
+
+from app.services.catalog import get_catalog, catalog_version, public_product
+
+# ------------------------------------------------------
+# TEXT NORMALIZATION
+# ------------------------------------------------------
+# Product names are transliterated Marathi ("ladoo" / "laddu" / "ladu",
+# "chivda" / "chiwda", "karanji" / "karanjee"), so tokens are folded to a
+# rough phonetic key before indexing and querying.
+
+FIELD_WEIGHTS = {"item_name": 3.0, "category": 2.0, "description": 1.0}
+
+_PHONETIC_RULES = [
+    ("chh", "ch"),
+    ("aa", "a"),
+    ("ee", "i"),
+    ("ii", "i"),
+    ("oo", "u"),
+    ("uu", "u"),
+    ("ph", "f"),
+    ("kh", "k"),
+    ("gh", "g"),
+    ("th", "t"),
+    ("dh", "d"),
+    ("bh", "b"),
+    ("sh", "s"),
+    ("w", "v"),
+    ("z", "j"),
+    ("q", "k"),
+]
+_REPEATS = re.compile(r"([a-z])\1+")
+# \w alone would split Devanagari words at their vowel signs
+_SPLIT = re.compile(r"[^\w\u0900-\u097F]+", re.UNICODE)
+
+
+def _fold_char(ch: str) -> str:
+    # strip accents from Latin letters only; Devanagari is kept as-is
+    if ord(ch) < 0x250:
+        return "".join(
+            c for c in unicodedata.normalize("NFKD", ch)
+            if not unicodedata.combining(c)
+        )
+    return ch
+
+
+def phonetic(token: str) -> str:
+    for src, dst in _PHONETIC_RULES:
+        token = token.replace(src, dst)
+    return _REPEATS.sub(r"\1", token)
+
+
+def tokenize(text: str):
+    if not text:
+        return []
+    text = "".join(_fold_char(c) for c in unicodedata.normalize("NFC", text.lower()))
+    return [phonetic(t) for t in _SPLIT.split(text) if t and t != "_"]
+
+
+def trigrams(token: str):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance, giving up early once it exceeds `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+# ------------------------------------------------------
+# INVERTED + TRIGRAM INDEX
+# ------------------------------------------------------
+class SearchSnapshot:
+    """
+    token   -> {product_id: field weight}   (inverted index)
+    trigram -> {token}                       (typo candidates)
+    vocab   -> sorted tokens                 (prefix lookups via bisect)
+
+    Built once from one catalog snapshot and never mutated, so a search
+    always sees postings, products and names from the same build.
+    """
+
+    MAX_PREFIX_EXPANSIONS = 50
+
+    def __init__(self, rows=()):
+        postings = defaultdict(dict)
+        trigram_index = defaultdict(set)
+        products = {}
+        names = {}
+
+        for row in rows:
+            if not row.get("is_enabled"):
+                continue
+
+            pid = row["id"]
+            products[pid] = public_product(row)
+            names[pid] = (row["item_name"] or "").lower()
+
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(row.get(field)):
+                    if postings[token].get(pid, 0) < weight:
+                        postings[token][pid] = weight
+
+        for token in postings:
+            for gram in trigrams(token):
+                trigram_index[gram].add(token)
+
+        self.postings = dict(postings)
+        self.trigram_index = dict(trigram_index)
+        self.vocab = sorted(postings)
+        self.products = products
+        self.names = names
+
+    # ----------------------------------------------
+    # MATCHING
+    # ----------------------------------------------
+    def _prefix_matches(self, token: str):
+        start = bisect_left(self.vocab, token)
+        for candidate in self.vocab[start:start + self.MAX_PREFIX_EXPANSIONS]:
+            if not candidate.startswith(token):
+                break
+            yield candidate
+
+    def _fuzzy_matches(self, token: str):
+        grams = trigrams(token)
+        shared = defaultdict(int)
+        for gram in grams:
+            for candidate in self.trigram_index.get(gram, ()):
+                shared[candidate] += 1
+
+        limit = 1 if len(token) <= 5 else 2
+        for candidate, count in shared.items():
+            similarity = count / (len(grams) + len(trigrams(candidate)) - count)
+            if similarity < 0.2:
+                continue
+            distance = bounded_edit_distance(token, candidate, limit)
+            if distance <= limit:
+                yield candidate, 1 - distance / (len(token) + 1)
+
+    def _token_scores(self, token: str):
+        """
+        {product_id: best score} for one query token.
+        exact 1.0 > prefix 0.8 > typo 0.6 * closeness, times field weight.
+        """
+        scores = {}
+
+        def add(candidate, factor):
+            for pid, weight in self.postings.get(candidate, {}).items():
+                score = weight * factor
+                if scores.get(pid, 0) < score:
+                    scores[pid] = score
+
+        add(token, 1.0)
+
+        if len(token) >= 2:
+            for candidate in self._prefix_matches(token):
+                if candidate != token:
+                    add(candidate, 0.8)
+
+        if len(token) >= 3:
+            for candidate, closeness in self._fuzzy_matches(token):
+                if candidate != token:
+                    add(candidate, 0.6 * closeness)
+
+        return scores
+
+    def search(self, query: str, limit: int = 20):
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        matched = defaultdict(int)
+        totals = defaultdict(float)
+        for token in tokens:
+            for pid, score in self._token_scores(token).items():
+                matched[pid] += 1
+                totals[pid] += score
+
+        ranked = sorted(
+            totals,
+            key=lambda pid: (-matched[pid], -totals[pid], self.names[pid]),
+        )
+
+        return [
+            {**self.products[pid], "score": round(totals[pid], 3)}
+            for pid in ranked[:limit]
+        ]
+
+
+class ProductSearchIndex:
+    """
+    The current SearchSnapshot, rebuilt after catalog_changed(). A rebuild
+    swaps the whole snapshot in one assignment; searches already running
+    keep the one they started with.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._snapshot = SearchSnapshot()
+
+    def build(self, rows):
+        self._snapshot = SearchSnapshot(rows)
+
+    def ensure_current(self, db: Session):
+        if self._version == catalog_version():
+            return
+        with self._lock:
+            version, rows = get_catalog(db)
+            if self._version != version:
+                self.build(rows)
+                self._version = version
+
+    def search(self, query: str, limit: int = 20):
+        return self._snapshot.search(query, limit)
+
+
+search_index = ProductSearchIndex()
+
+
+def search_products(db: Session, query: str, limit: int = 20):
+    search_index.ensure_current(db)
+    return search_index.search(query, limit)
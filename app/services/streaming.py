@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+
+# flush to the client roughly every 64 KB
+CHUNK_SIZE = 64 * 1024
+
+
+# ------------------------------------------------------
+# CSV / NDJSON STREAM WRITERS
+# ------------------------------------------------------
+def iter_csv(rows, fieldnames):
+    """
+    Yield CSV text in ~64 KB chunks from an iterable of dicts.
+    Only one chunk is held in memory at a time.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_ndjson(rows):
+    """
+    Yield newline-delimited JSON in ~64 KB chunks from an iterable of dicts.
+    """
+    chunk = []
+    size = 0
+
+    for row in rows:
+        line = json.dumps(row, default=str, ensure_ascii=False) + "\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+            size = 0
+
+    if chunk:
+        yield "".join(chunk)
+
+
+# ------------------------------------------------------
+# UPLOAD READERS
+# ------------------------------------------------------
+def read_upload_rows(file, fmt: str):
+    """
+    Lazily parse an uploaded file into (line_no, dict | Exception) pairs.
+    CSV empty cells are dropped so they don't overwrite existing values.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            cleaned = {
+                k.strip(): v.strip()
+                for k, v in row.items()
+                if k and isinstance(v, str) and v.strip() != ""
+            }
+            if cleaned:
+                yield reader.line_num, cleaned
+        return
+
+    for line_no, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_no, e
+            continue
+        if not isinstance(row, dict):
+            yield line_no, ValueError("Row must be a JSON object")
+            continue
+        yield line_no, row
+
+
+def detect_format(filename: str, fmt: str = None):
+    if fmt:
+        return fmt
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "csv"
@@ -0,0 +1,57 @@
+import json
+import re
+
+# ------------------------------------------------------
+# 🔧 VARIANT PARSER (WEIGHT + PCS)
+# ------------------------------------------------------
+_NUMBER = re.compile(r"(\d+(?:\.\d+)?)")
+
+
+def convert_to_grams(variant: str):
+    """
+    Returns:
+    (weight_in_grams, pieces)
+    """
+    if not variant:
+        return 0, 0
+
+    v = variant.lower().replace(" ", "")
+
+    match = _NUMBER.search(v)
+    if not match:
+        return 0, 0
+
+    value = float(match.group(1))
+
+    # WEIGHT
+    if "kg" in v:
+        return int(value * 1000), 0
+    if "gm" in v or "g" in v:
+        return int(value), 0
+
+    # PIECES
+    if "pcs" in v or "ps" in v or "pc" in v:
+        return 0, int(value)
+
+    return 0, 0
+
+
+def items_load(items):
+    """
+    Total (grams, pieces) for a list of order / cart lines.
+    """
+    if isinstance(items, str):
+        items = json.loads(items)
+
+    grams = pieces = 0
+    for item in items or []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            quantity = int(item.get("quantity", 0))
+        except (TypeError, ValueError):
+            continue
+        weight, count = convert_to_grams(item.get("variant") or "")
+        grams += weight * quantity
+        pieces += count * quantity
+    return grams, pieces
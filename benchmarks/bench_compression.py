@@ -0,0 +1,147 @@
+"""
+CPU cost vs bytes saved for the response compression middleware.
+
+    python benchmarks/bench_compression.py
+
+Payloads mimic /api/admin/orders (500 rows with items + address),
+/api/orders for one customer, /api/admin/kitchen-prep and products-state.
+"""
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.compression import CompressionMiddleware, available_encodings  # noqa: E402
+
+random.seed(7)
+
+NAMES = [
+    "Besan Ladoo", "Poha Chivda", "Karanji", "Chakli", "Shankarpali",
+    "Anarse", "Kaju Katli", "Rava Ladoo", "Bhajani Chakli", "Shev",
+]
+VARIANTS = ["250gm", "500gm", "1kg", "12pcs", "24pcs"]
+CITIES = ["Pune", "Mumbai", "Nashik", "Satara"]
+
+
+def _order(i):
+    return {
+        "id": i,
+        "user_id": random.randint(1, 5000),
+        "first_name": random.choice(["Asha", "Rahul", "Meera", "Vinay", "Sneha"]),
+        "mobile_number": f"98{random.randint(10000000, 99999999)}",
+        "delivery_date": "2026-10-25",
+        "order_status": random.choice(["placed", "confirmed", "inprocess", "delivered"]),
+        "razorpay_order_id": f"order_{random.getrandbits(64):016x}",
+        "razorpay_payment_id": f"pay_{random.getrandbits(64):016x}",
+        "total_amount": round(random.uniform(200, 4000), 2),
+        "created_at": "2026-10-19T10:15:00",
+        "updated_at": None,
+        "address": {
+            "id": random.randint(1, 10**6),
+            "line1": f"{random.randint(1, 400)}, Shivaji Nagar, Near Ganesh Mandir",
+            "line2": "Flat 12, Sai Residency",
+            "city": random.choice(CITIES),
+            "state": "Maharashtra",
+            "pincode": f"4110{random.randint(10, 99)}",
+            "type": "home",
+        },
+        "items": [
+            {
+                "id": random.randint(1, 120),
+                "name": random.choice(NAMES),
+                "variant": random.choice(VARIANTS),
+                "quantity": random.randint(1, 4),
+                "price": random.choice([120, 180, 240, 360, 480]),
+                "originalPrice": 500,
+                "weight": 250,
+                "image": "https://res.cloudinary.com/demo/image/upload/v1/my_uploads/sample.jpg",
+            }
+            for _ in range(random.randint(1, 6))
+        ],
+    }
+
+
+def payloads():
+    admin_orders = [_order(i) for i in range(500)]
+    user_orders = {"data": [_order(i) for i in range(40)], "message": "Orders fetched successfully"}
+    kitchen = [
+        {
+            "name": n,
+            "totalQuantity": random.randint(10, 90),
+            "totalWeight": random.randint(1000, 20000),
+            "totalPieces": random.randint(0, 200),
+            "orderCount": random.randint(3, 60),
+            "variants": [
+                {"variant": v, "quantity": 5, "weight": 1250, "pieces": 0} for v in VARIANTS
+            ],
+            "priority": "high",
+            "estimatedPrepTime": 45,
+        }
+        for n in NAMES
+    ]
+    products = [
+        {
+            "id": i,
+            "item_name": f"{random.choice(NAMES)} {i}",
+            "category": random.choice(["Sweets", "Namkeen", "Festive"]),
+            "description": "Traditional recipe made fresh in pure ghee, no preservatives.",
+            "image_url": "https://res.cloudinary.com/demo/image/upload/v1/my_uploads/sample.jpg",
+            "variants": [{"packing": v, "price": 120.0} for v in VARIANTS[:4]],
+            "max_price": 480.0,
+            "shelf_life_days": 20,
+            "lead_time_days": 2,
+            "is_enabled": True,
+        }
+        for i in range(150)
+    ]
+    return {
+        "admin_orders(500)": admin_orders,
+        "user_orders(40)": user_orders,
+        "kitchen_prep": kitchen,
+        "products_state(150)": products,
+    }
+
+
+def measure(middleware, encoding, body, repeat=15):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        c = middleware.compressor(encoding)
+        start = time.perf_counter()
+        out = c.compress(body) + c.finish()
+        timings.append(time.perf_counter() - start)
+        size = len(out)
+    return statistics.median(timings), size
+
+
+def main():
+    settings = [("gzip", lvl) for lvl in (1, 6, 9)]
+    if "br" in available_encodings():
+        settings += [("br", q) for q in (1, 4, 6, 11)]
+    if "zstd" in available_encodings():
+        settings += [("zstd", lvl) for lvl in (1, 3, 9)]
+
+    print(f"{'payload':22} {'raw':>9} {'codec':>8} {'bytes':>9} {'ratio':>6} {'ms':>8} {'MB/s':>8}")
+    for name, data in payloads().items():
+        body = json.dumps(data).encode()
+        for encoding, level in settings:
+            mw = CompressionMiddleware(
+                None,
+                gzip_level=level,
+                brotli_quality=level,
+                zstd_level=level,
+            )
+            seconds, size = measure(mw, encoding, body, repeat=3 if level >= 11 else 15)
+            print(
+                f"{name:22} {len(body):>9} {encoding + ':' + str(level):>8} {size:>9} "
+                f"{len(body) / size:>6.1f} {seconds * 1000:>8.2f} {len(body) / seconds / 1e6:>8.1f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
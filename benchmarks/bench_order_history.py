@@ -0,0 +1,128 @@
+"""
+Customer order history: old query (full rows + joinedload(Order.user), no
+composite index) vs the projected query served by ix_orders_user_id_created_at.
+
+    python benchmarks/bench_order_history.py
+
+Runs against an in-memory SQLite copy of the schema, so absolute numbers are
+only indicative — compare the plans and the relative timings.
+"""
+import datetime
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import Session, joinedload  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database.session import Base  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.orders import Order  # noqa: E402
+from app.models import product, kitchenPrep  # noqa: E402,F401
+from app.routes.payment import ORDER_SUMMARY_COLUMNS  # noqa: E402
+
+random.seed(11)
+
+USERS = 2000
+ORDERS = 60000
+HEAVY_USER_ORDERS = 400
+
+def _items():
+    return [
+        {
+            "id": random.randint(1, 120),
+            "name": "Besan Ladoo",
+            "variant": random.choice(["250gm", "500gm", "1kg"]),
+            "quantity": random.randint(1, 4),
+            "price": random.choice([120, 240, 480]),
+        }
+        for _ in range(random.randint(1, 6))
+    ]
+
+
+def seed(db: Session):
+    db.add_all(
+        User(id=i, first_name=f"User {i}", email=f"u{i}@example.com", mobile_number=f"98{i:08d}")
+        for i in range(1, USERS + 1)
+    )
+    start = datetime.datetime(2024, 1, 1)
+    rows = []
+    for i in range(ORDERS):
+        user_id = 1 if i < HEAVY_USER_ORDERS else random.randint(2, USERS)
+        rows.append({
+            "user_id": user_id,
+            "address": {"line1": "12, Shivaji Nagar", "city": "Pune", "pincode": "411005"},
+            "items": _items(),
+            "total_amount": random.uniform(200, 4000),
+            "order_status": random.choice(["placed", "confirmed", "delivered"]),
+            "razorpay_order_id": f"order_{i:012d}",
+            "created_at": start + datetime.timedelta(minutes=random.randint(0, 10**6)),
+        })
+    db.execute(Order.__table__.insert(), rows)
+    db.commit()
+
+
+def old_query(db: Session, user_id: int):
+    orders = (
+        db.query(Order)
+        .options(joinedload(Order.user))
+        .filter(Order.user_id == user_id)
+        .order_by(Order.created_at.desc())
+        .all()
+    )
+    return [(o.id, o.items, o.address) for o in orders]
+
+
+def new_query(db: Session, user_id: int, summary: bool):
+    columns = ORDER_SUMMARY_COLUMNS if summary else (*ORDER_SUMMARY_COLUMNS, Order.items, Order.address)
+    return (
+        db.query(*columns)
+        .filter(Order.user_id == user_id)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .all()
+    )
+
+
+def timed(fn, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def plan(db: Session, user_id: int):
+    sql = (
+        "EXPLAIN QUERY PLAN SELECT id FROM orders "
+        "WHERE user_id = :u ORDER BY created_at DESC, id DESC"
+    )
+    return "; ".join(r[-1] for r in db.execute(text(sql), {"u": user_id}))
+
+
+def main():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        seed(db)
+
+        db.execute(text("DROP INDEX ix_orders_user_id_created_at"))
+        print("without composite index:", plan(db, 1))
+        print(f"  old (full rows + joinedload) : {timed(lambda: old_query(db, 1)):8.2f} ms")
+
+        db.execute(text("CREATE INDEX ix_orders_user_id_created_at ON orders (user_id, created_at)"))
+        db.execute(text("ANALYZE"))
+        print("with composite index   :", plan(db, 1))
+        print(f"  old (full rows + joinedload) : {timed(lambda: old_query(db, 1)):8.2f} ms")
+        print(f"  new (projected)              : {timed(lambda: new_query(db, 1, False)):8.2f} ms")
+        print(f"  new (summary=true)           : {timed(lambda: new_query(db, 1, True)):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
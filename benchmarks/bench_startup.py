@@ -0,0 +1,73 @@
+"""
+Worker import-time budget.
+
+    python benchmarks/bench_startup.py [--budget-ms 1500] [--runs 5]
+
+Imports `main` in fresh interpreters (what every uvicorn worker does on
+boot / recycle), reports the median wall time and the slowest modules from
+`python -X importtime`, and exits non-zero when the median is over budget.
+The lifespan handler (schema check, admin seed, page pre-render) is not
+included — it needs a database.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_once(importtime=False):
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", "import main"]
+
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+
+    if proc.returncode != 0:
+        sys.exit(f"import main failed:\n{proc.stderr}")
+    return elapsed, proc.stderr
+
+
+def slowest_modules(report, top=15):
+    """
+    Parse `-X importtime` lines: "import time: self [us] | cumulative | name".
+    """
+    rows = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    # by self time: where the import budget actually goes
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", 1500)))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    import_once()  # warm the OS file cache / .pyc files
+    timings = [import_once()[0] for _ in range(args.runs)]
+    median_ms = statistics.median(timings) * 1000
+
+    _, report = import_once(importtime=True)
+    print(f"{'self ms':>9} {'cumulative ms':>14}  module")
+    for self_us, cumulative, name in slowest_modules(report):
+        print(f"{self_us / 1000:>9.1f} {cumulative / 1000:>14.1f}  {name}")
+
+    print()
+    print(f"import main: median {median_ms:.0f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    if median_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
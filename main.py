@@ -1,43 +1,96 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, Cookie, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import APIRouter
 
-import cloudinary
-import cloudinary.uploader
-import os
-
 # ------------------------------
-# ENV + Cloudinary Configuration
+# Settings (.env is loaded once, here)
 # ------------------------------
-from dotenv import load_dotenv
-load_dotenv()
-
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
+from app.core.config import get_settings
+settings = get_settings()
 
 # ------------------------------
 # Database setup
 # ------------------------------
-from app.database.session import Base, engine
-from app.models.product import Product  # ensure model registration
+from app.database.session import engine, read_engine, SessionLocal
+from app.database.migrations import check_schema
+from app.core.assets import PrecompressedStaticFiles
+from app.core.compression import CompressionMiddleware
+from app.core.templates import prerender_static_pages, static_page
+from app.services.audit import configure_audit_log
+from app.services.images import process_upload
+from app.services.invalidation import bus, transport_from_url
+from app.services.carts import cart_store, backend_from_url, flush_periodically, flush_now
+from app.services.order_jobs import register_order_jobs
+from app.services.scheduler import scheduler, DbLeaderLock
 
 # ------------------------------
 # Route Imports
 # ------------------------------
 from app.routes import auth, products, cart, otp, payment, admins
-from app.routes.admins_ops import router as admins_ops_router
+from app.routes.admins_ops import router as admins_ops_router, create_default_admin
+
+# ------------------------------
+# Startup / shutdown
+# ------------------------------
+# Nothing above touches the database or external services, so importing
+# this module stays cheap (see benchmarks/bench_startup.py). Everything
+# that does runs once per worker here.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # tables are owned by Alembic — `alembic upgrade head`
+    check_schema(engine)
+
+    # bulk status changes write one audit record each
+    configure_audit_log(settings.audit_log_path)
+
+    with SessionLocal() as db:
+        create_default_admin(db)
+
+    prerender_static_pages()
+
+    # other workers' writes invalidate this worker's caches
+    bus.start(transport_from_url(settings.invalidation_url))
+
+    # carts live in the carts table, or in redis / memory written behind in batches
+    cart_store.backend = backend_from_url(settings.cart_store_url, SessionLocal)
+    cart_flusher = asyncio.create_task(
+        flush_periodically(cart_store, SessionLocal, settings.cart_flush_interval)
+    )
+
+    # expire abandoned checkouts / reconcile missed payments (one leader)
+    scheduler_task = None
+    if settings.scheduler_enabled:
+        scheduler.tick_seconds = settings.scheduler_tick_seconds
+        register_order_jobs(scheduler, settings)
+        scheduler_task = asyncio.create_task(
+            scheduler.run_forever(SessionLocal, DbLeaderLock(engine))
+        )
+
+    if not settings.razorpay_configured and not settings.razorpay_stub:
+        print("⚠️ Razorpay keys not configured — checkout is disabled")
+
+    yield
+
+    cart_flusher.cancel()
+    if scheduler_task is not None:
+        scheduler_task.cancel()
+        scheduler.stop()
+    flush_now(cart_store, SessionLocal)
+    bus.stop()
+    admins.dashboard_pool.shutdown(wait=False, cancel_futures=True)
+    engine.dispose()
+    if read_engine is not None:
+        read_engine.dispose()
 
 # ------------------------------
 # Initialize FastAPI app
 # ------------------------------
-app = FastAPI(title="Gokhale Backend API")
+app = FastAPI(title="Gokhale Backend API", lifespan=lifespan)
 
 # ------------------------------
 # CORS Middleware
@@ -53,11 +106,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ------------------------------
+# Response compression (zstd / br / gzip)
+# ------------------------------
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+    zstd_level=settings.compression_zstd_level,
+)
+
 # ------------------------------
 # Static files & templates
 # ------------------------------
-app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
+# ✅ serves .br/.gz variants + immutable caching for hashed names
+#    (build with: python -m app.core.assets)
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
 # ------------------------------
 # API ROUTER (PREFIX = /api)
@@ -68,13 +133,16 @@ api_router = APIRouter(prefix="/api")
 async def upload_image(file: UploadFile = File(...)):
     """
     Upload image to Cloudinary and return secure URL
+    + resized WebP/JPEG derivatives (thumbnail, card, detail)
     """
     try:
-        result = cloudinary.uploader.upload(
-            file.file,
-            folder="my_uploads"
-        )
-        return {"image_url": result["secure_url"]}
+        data = await file.read()
+        # resizing + uploads are blocking — keep them off the event loop
+        image_url, variants = await run_in_threadpool(process_upload, data)
+        return {
+            "image_url": image_url,
+            "image_variants": variants,
+        }
 
     except Exception as e:
         return {"error": str(e)}
@@ -90,21 +158,10 @@ app.include_router(payment.router)
 app.include_router(admins.router)
 app.include_router(admins_ops_router)
 
-# ------------------------------
-# Create DB Tables
-# ------------------------------
-Base.metadata.create_all(bind=engine)
-
 # ------------------------------
 # Root Page
 # ------------------------------
 @app.get("/", response_class=HTMLResponse)
 def index(request: Request, logged_in: str = Cookie(default=None)):
-    is_logged_in = request.cookies.get("logged_in") == "true"
-    return templates.TemplateResponse(
-        "products.html",
-        {
-            "request": request,
-            "is_logged_in": is_logged_in
-        }
-    )
+    # ✅ pre-rendered at startup (one variant per logged-in state)
+    return static_page(request, "products.html")
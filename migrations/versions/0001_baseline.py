@@ -0,0 +1,91 @@
+"""baseline — schema as previously created by Base.metadata.create_all()
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("first_name", sa.String(100)),
+        sa.Column("last_name", sa.String(100)),
+        sa.Column("email", sa.String(100)),
+        sa.Column("mobile_number", sa.String(15)),
+        sa.Column("password", sa.String(255)),
+        sa.Column("address", sa.JSON()),
+        sa.Column("security_questions", sa.JSON(), nullable=True),
+        sa.Column("customer_id", sa.String(20)),
+        sa.Column("internal_id", sa.String(36), unique=True),
+        sa.Column("role", sa.String(20)),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_mobile_number", "users", ["mobile_number"], unique=True)
+    op.create_index("ix_users_customer_id", "users", ["customer_id"], unique=True)
+
+    op.create_table(
+        "admins_ops",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False, unique=True),
+        sa.Column("password", sa.String(255), nullable=False),
+    )
+    op.create_index("ix_admins_ops_id", "admins_ops", ["id"])
+
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("item_name", sa.String(100), nullable=False),
+        sa.Column("category", sa.String(100), nullable=True),
+        sa.Column("shelf_life_days", sa.Integer(), nullable=True),
+        sa.Column("lead_time_days", sa.Integer(), nullable=True),
+        sa.Column("packing_01", sa.String(50), nullable=True),
+        sa.Column("price_01", sa.Float(), nullable=True),
+        sa.Column("packing_02", sa.String(50), nullable=True),
+        sa.Column("price_02", sa.Float(), nullable=True),
+        sa.Column("packing_03", sa.String(50), nullable=True),
+        sa.Column("price_03", sa.Float(), nullable=True),
+        sa.Column("packing_04", sa.String(50), nullable=True),
+        sa.Column("price_04", sa.Float(), nullable=True),
+        sa.Column("description", sa.String(255), nullable=True),
+        sa.Column("imagesrc", sa.String(255), nullable=True),
+        sa.Column("is_enabled", sa.Boolean()),
+    )
+    op.create_index("ix_products_id", "products", ["id"])
+
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("first_name", sa.String(100), nullable=True),
+        sa.Column("mobile_number", sa.String(20), nullable=True),
+        sa.Column("delivery_date", sa.Date(), nullable=True),
+        sa.Column("address", sa.JSON(), nullable=False),
+        sa.Column("items", sa.JSON(), nullable=False),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("order_status", sa.String(20)),
+        sa.Column("razorpay_order_id", sa.String(50)),
+        sa.Column("razorpay_payment_id", sa.String(50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_orders_id", "orders", ["id"])
+    op.create_index("ix_orders_order_status", "orders", ["order_status"])
+    op.create_index("ix_orders_razorpay_order_id", "orders", ["razorpay_order_id"], unique=True)
+
+
+def downgrade():
+    op.drop_table("orders")
+    op.drop_table("products")
+    op.drop_table("admins_ops")
+    op.drop_table("users")
@@ -0,0 +1,33 @@
+"""products.image_variants — responsive image derivative URLs
+
+Revision ID: 0001a_product_image_variants
+Revises: 0001_baseline
+Create Date: 2026-10-19
+
+Databases created by create_all() after the column was added to the
+model already have it, so it is only added when missing.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision = "0001a_product_image_variants"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+
+def _columns(table):
+    # offline (--sql) mode can't inspect: emit everything
+    if context.is_offline_mode():
+        return set()
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    if "image_variants" not in _columns("products"):
+        op.add_column("products", sa.Column("image_variants", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("products", "image_variants")
@@ -0,0 +1,42 @@
+"""orders.idempotency_key — reuse a pending checkout instead of creating another
+
+Revision ID: 0001b_order_idempotency_key
+Revises: 0001a_product_image_variants
+Create Date: 2026-10-19
+
+Databases created by create_all() after the column was added to the
+model already have it, so it is only added when missing.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision = "0001b_order_idempotency_key"
+down_revision = "0001a_product_image_variants"
+branch_labels = None
+depends_on = None
+
+
+def _columns(table):
+    # offline (--sql) mode can't inspect: emit everything
+    if context.is_offline_mode():
+        return set()
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _indexes(table):
+    if context.is_offline_mode():
+        return set()
+    return {i["name"] for i in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    if "idempotency_key" not in _columns("orders"):
+        op.add_column("orders", sa.Column("idempotency_key", sa.String(64), nullable=True))
+    if "ix_orders_idempotency_key" not in _indexes("orders"):
+        op.create_index("ix_orders_idempotency_key", "orders", ["idempotency_key"])
+
+
+def downgrade():
+    op.drop_index("ix_orders_idempotency_key", table_name="orders")
+    op.drop_column("orders", "idempotency_key")
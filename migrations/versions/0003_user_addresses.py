@@ -0,0 +1,146 @@
+"""user_addresses table, populated from the users.address JSON array
+
+Revision ID: 0003_user_addresses
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-19
+
+users.address is left in place (no longer written) so this can be rolled
+back; drop it in a later migration. downgrade() writes the table back into
+users.address, so addresses saved / edited / deleted after the upgrade
+survive a rollback.
+"""
+import json
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision = "0003_user_addresses"
+down_revision = "0002_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _text(value, length):
+    return str(value if value is not None else "").strip()[:length]
+
+
+def _address_rows(user_id, addresses):
+    if isinstance(addresses, str):
+        try:
+            addresses = json.loads(addresses)
+        except ValueError:
+            return
+    seen = set()
+    for addr in addresses or []:
+        if not isinstance(addr, dict) or not addr.get("line1"):
+            continue
+        row = {
+            "user_id": user_id,
+            "line1": _text(addr.get("line1"), 255),
+            "line2": _text(addr.get("line2"), 255) or None,
+            "city": _text(addr.get("city"), 100),
+            "state": _text(addr.get("state"), 100),
+            "pincode": _text(addr.get("pincode"), 10),
+            "type": _text(addr.get("type") or "home", 20),
+        }
+        # the JSON array never enforced uniqueness — keep the first copy
+        if (row["line1"], row["pincode"]) in seen:
+            continue
+        seen.add((row["line1"], row["pincode"]))
+        yield row
+
+
+def upgrade():
+    user_addresses = op.create_table(
+        "user_addresses",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("line1", sa.String(255), nullable=False),
+        sa.Column("line2", sa.String(255), nullable=True),
+        sa.Column("city", sa.String(100), nullable=False),
+        sa.Column("state", sa.String(100), nullable=False),
+        sa.Column("pincode", sa.String(10), nullable=False),
+        sa.Column("type", sa.String(20)),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.UniqueConstraint("user_id", "line1", "pincode", name="uq_user_addresses_user_line1_pincode"),
+    )
+    op.create_index("ix_user_addresses_id", "user_addresses", ["id"])
+
+    # offline (--sql) mode can't read users.address
+    if context.is_offline_mode():
+        return
+
+    conn = op.get_bind()
+    users = sa.table("users", sa.column("id", sa.Integer()), sa.column("address", sa.JSON()))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(users.c.id, users.c.address)
+            .where(users.c.id > last_id, users.c.address.isnot(None))
+            .order_by(users.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        batch = []
+        for user_id, addresses in rows:
+            batch.extend(_address_rows(user_id, addresses))
+        if batch:
+            op.bulk_insert(user_addresses, batch)
+
+
+def _restore_user_address_json(conn):
+    """
+    user_addresses -> users.address (same shape the old endpoints wrote,
+    ids included), BATCH_SIZE users per UPDATE.
+    """
+    users = sa.table("users", sa.column("id", sa.Integer()), sa.column("address", sa.JSON()))
+    addresses = sa.table(
+        "user_addresses",
+        *(sa.column(name) for name in ("id", "user_id", "line1", "line2", "city", "state", "pincode", "type")),
+    )
+
+    # the table is the source of truth since the upgrade: users whose
+    # addresses were all deleted must not get the old list back
+    conn.execute(users.update().values(address=sa.null()))
+
+    last_user_id = 0
+    while True:
+        user_ids = conn.execute(
+            sa.select(addresses.c.user_id)
+            .where(addresses.c.user_id > last_user_id)
+            .group_by(addresses.c.user_id)
+            .order_by(addresses.c.user_id)
+            .limit(BATCH_SIZE)
+        ).scalars().all()
+        if not user_ids:
+            return
+        last_user_id = user_ids[-1]
+
+        by_user = {}
+        for row in conn.execute(
+            sa.select(addresses)
+            .where(addresses.c.user_id.in_(user_ids))
+            .order_by(addresses.c.user_id, addresses.c.id)
+        ).mappings():
+            entry = {k: row[k] for k in ("id", "line1", "line2", "city", "state", "pincode", "type")}
+            by_user.setdefault(row["user_id"], []).append(entry)
+
+        conn.execute(
+            users.update()
+            .where(users.c.id == sa.bindparam("user_id"))
+            .values(address=sa.bindparam("address")),
+            [{"user_id": user_id, "address": entries} for user_id, entries in by_user.items()],
+        )
+
+
+def downgrade():
+    if not context.is_offline_mode():
+        _restore_user_address_json(op.get_bind())
+    op.drop_index("ix_user_addresses_id", table_name="user_addresses")
+    op.drop_table("user_addresses")
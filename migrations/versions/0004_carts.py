@@ -0,0 +1,28 @@
+"""carts — server-side cart per customer
+
+Revision ID: 0004_carts
+Revises: 0003_user_addresses
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_carts"
+down_revision = "0003_user_addresses"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "carts",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("items", sa.JSON(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("carts")
@@ -0,0 +1,65 @@
+"""delivery_capacity — booked kitchen load per delivery date
+
+Revision ID: 0005_delivery_capacity
+Revises: 0004_carts
+Create Date: 2026-10-19
+
+Backfilled from existing paid orders; maintained incrementally from then on
+by app.services.capacity.
+"""
+from collections import defaultdict
+from datetime import date
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.services.units import items_load
+
+
+revision = "0005_delivery_capacity"
+down_revision = "0004_carts"
+branch_labels = None
+depends_on = None
+
+BOOKED_STATUSES = ("placed", "confirmed", "inprocess", "dispatched", "delivered", "completed")
+
+
+def upgrade():
+    capacity = op.create_table(
+        "delivery_capacity",
+        sa.Column("delivery_date", sa.Date(), primary_key=True),
+        sa.Column("booked_grams", sa.Integer(), nullable=False),
+        sa.Column("booked_pieces", sa.Integer(), nullable=False),
+    )
+
+    if context.is_offline_mode():
+        return
+
+    orders = sa.table(
+        "orders",
+        sa.column("delivery_date", sa.Date()),
+        sa.column("items", sa.JSON()),
+        sa.column("order_status", sa.String()),
+    )
+    result = op.get_bind().execute(
+        sa.select(orders.c.delivery_date, orders.c["items"]).where(
+            orders.c.order_status.in_(BOOKED_STATUSES),
+            orders.c.delivery_date >= date.today(),
+        )
+    )
+
+    totals = defaultdict(lambda: [0, 0])
+    for delivery_date, items in result:
+        grams, pieces = items_load(items)
+        totals[delivery_date][0] += grams
+        totals[delivery_date][1] += pieces
+
+    if totals:
+        op.bulk_insert(capacity, [
+            {"delivery_date": d, "booked_grams": g, "booked_pieces": p}
+            for d, (g, p) in totals.items()
+        ])
+
+
+def downgrade():
+    op.drop_table("delivery_capacity")
@@ -0,0 +1,23 @@
+"""indexes for the admin orders filters (delivery date, phone prefix)
+
+Revision ID: 0006_admin_order_filters
+Revises: 0005_delivery_capacity
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+revision = "0006_admin_order_filters"
+down_revision = "0005_delivery_capacity"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_orders_delivery_date", "orders", ["delivery_date"])
+    op.create_index("ix_orders_mobile_number", "orders", ["mobile_number"])
+
+
+def downgrade():
+    op.drop_index("ix_orders_mobile_number", table_name="orders")
+    op.drop_index("ix_orders_delivery_date", table_name="orders")
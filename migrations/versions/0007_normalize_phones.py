@@ -0,0 +1,111 @@
+"""normalize stored phone numbers + index orders.first_name for admin search
+
+Revision ID: 0007_normalize_phones
+Revises: 0006_admin_order_filters
+Create Date: 2026-10-19
+
+Rewrites users.mobile_number and orders.mobile_number to the bare 10-digit
+form app.services.phones.normalize_phone produces, so equality / prefix
+lookups hit the index. A user whose normalized number already belongs to
+another account is left unchanged and reported.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.services.phones import normalize_phone
+
+
+revision = "0007_normalize_phones"
+down_revision = "0006_admin_order_filters"
+branch_labels = None
+depends_on = None
+
+BATCH = 5000
+
+
+def _normalize_users(conn):
+    users = sa.table("users", sa.column("id", sa.Integer), sa.column("mobile_number", sa.String))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(users.c.id, users.c.mobile_number)
+            .where(users.c.id > last_id, users.c.mobile_number.isnot(None))
+            .order_by(users.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+
+        wanted = {}
+        for user_id, number in rows:
+            normalized = normalize_phone(number)
+            if normalized and normalized != number:
+                wanted[user_id] = (number, normalized)
+        if not wanted:
+            continue
+
+        # numbers already stored anywhere (earlier batches included)
+        taken = set(conn.execute(
+            sa.select(users.c.mobile_number)
+            .where(users.c.mobile_number.in_({n for _, n in wanted.values()}))
+        ).scalars())
+
+        changed = []
+        for user_id, (number, normalized) in wanted.items():
+            if normalized in taken:
+                print(f"⚠️ user {user_id}: {number!r} normalizes to {normalized!r}, already in use — left as is")
+                continue
+            taken.add(normalized)
+            changed.append({"user_id": user_id, "number": normalized})
+        if changed:
+            conn.execute(
+                users.update()
+                .where(users.c.id == sa.bindparam("user_id"))
+                .values(mobile_number=sa.bindparam("number")),
+                changed,
+            )
+
+
+def _normalize_orders(conn):
+    orders = sa.table("orders", sa.column("id", sa.Integer), sa.column("mobile_number", sa.String))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(orders.c.id, orders.c.mobile_number)
+            .where(orders.c.id > last_id, orders.c.mobile_number.isnot(None))
+            .order_by(orders.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+
+        changed = []
+        for order_id, number in rows:
+            normalized = normalize_phone(number) or None
+            if normalized != number:
+                changed.append({"order_id": order_id, "number": normalized})
+        if changed:
+            conn.execute(
+                orders.update()
+                .where(orders.c.id == sa.bindparam("order_id"))
+                .values(mobile_number=sa.bindparam("number")),
+                changed,
+            )
+
+
+def upgrade():
+    op.create_index("ix_orders_first_name", "orders", ["first_name"])
+
+    # data rewrite needs a live connection
+    if context.is_offline_mode():
+        return
+    conn = op.get_bind()
+    _normalize_users(conn)
+    _normalize_orders(conn)
+
+
+def downgrade():
+    # normalized numbers are kept
+    op.drop_index("ix_orders_first_name", table_name="orders")
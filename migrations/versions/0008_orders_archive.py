@@ -0,0 +1,54 @@
+"""orders_archive — cold storage for finished orders
+
+Revision ID: 0008_orders_archive
+Revises: 0007_normalize_phones
+Create Date: 2026-10-19
+
+On MySQL the table is RANGE partitioned on TO_DAYS(created_at). It starts
+with a single catch-all partition; app.services.archive splits off one
+partition per month as it archives into it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_orders_archive"
+down_revision = "0007_normalize_phones"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "orders_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("first_name", sa.String(100), nullable=True),
+        sa.Column("mobile_number", sa.String(20), nullable=True),
+        sa.Column("delivery_date", sa.Date(), nullable=True),
+        sa.Column("address", sa.JSON(), nullable=False),
+        sa.Column("items", sa.JSON(), nullable=False),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("order_status", sa.String(20), nullable=True),
+        sa.Column("razorpay_order_id", sa.String(50), nullable=True),
+        sa.Column("razorpay_payment_id", sa.String(50), nullable=True),
+        sa.Column("idempotency_key", sa.String(64), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+    )
+    op.create_index("ix_orders_archive_user_id_created_at", "orders_archive", ["user_id", "created_at"])
+    op.create_index("ix_orders_archive_order_status_created_at", "orders_archive", ["order_status", "created_at"])
+    op.create_index("ix_orders_archive_mobile_number", "orders_archive", ["mobile_number"])
+    op.create_index("ix_orders_archive_razorpay_order_id", "orders_archive", ["razorpay_order_id"])
+
+    if op.get_context().dialect.name == "mysql":
+        op.execute(
+            "ALTER TABLE orders_archive PARTITION BY RANGE (TO_DAYS(created_at)) "
+            "(PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        )
+
+
+def downgrade():
+    op.drop_table("orders_archive")
@@ -0,0 +1,21 @@
+"""index orders_archive.first_name for admin order search
+
+Revision ID: 0009_orders_archive_first_name
+Revises: 0008_orders_archive
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+revision = "0009_orders_archive_first_name"
+down_revision = "0008_orders_archive"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_orders_archive_first_name", "orders_archive", ["first_name"])
+
+
+def downgrade():
+    op.drop_index("ix_orders_archive_first_name", table_name="orders_archive")
@@ -30,6 +30,8 @@ const state = {
   currentTab: "recent",
   currentPage: 1,
   searchQuery: "",
+  searchResults: null,
+  searchRequest: 0,
   sortBy: "created_at",
   sortOrder: "desc",
   isLoading: false,
@@ -276,10 +278,10 @@ function setupEventListeners() {
   }
 
   if (elements.startDate) {
-    elements.startDate.addEventListener("change", applyFiltersAndRender)
+    elements.startDate.addEventListener("change", () => loadOrders(true))
   }
   if (elements.endDate) {
-    elements.endDate.addEventListener("change", applyFiltersAndRender)
+    elements.endDate.addEventListener("change", () => loadOrders(true))
   }
 
   // Bulk actions
@@ -447,12 +449,55 @@ function setupEventListeners() {
 }
 
 // Orders Functions
+function localISODate(d) {
+  return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, "0")}-${String(d.getDate()).padStart(2, "0")}`
+}
+
+// date filter is applied by the server (indexed created_at range);
+// tabs / search still filter the loaded window in the browser
+function orderListQuery() {
+  const params = new URLSearchParams()
+  const today = new Date()
+
+  switch (state.dateFilter) {
+    case "today":
+      params.set("date_from", localISODate(today))
+      break
+    case "yesterday": {
+      const yesterday = new Date(today)
+      yesterday.setDate(yesterday.getDate() - 1)
+      params.set("date_from", localISODate(yesterday))
+      params.set("date_to", localISODate(yesterday))
+      break
+    }
+    case "week": {
+      const weekAgo = new Date(today)
+      weekAgo.setDate(weekAgo.getDate() - 7)
+      params.set("date_from", localISODate(weekAgo))
+      break
+    }
+    case "month": {
+      const monthAgo = new Date(today)
+      monthAgo.setMonth(monthAgo.getMonth() - 1)
+      params.set("date_from", localISODate(monthAgo))
+      break
+    }
+    case "custom":
+      if (elements.startDate?.value) params.set("date_from", elements.startDate.value)
+      if (elements.endDate?.value) params.set("date_to", elements.endDate.value)
+      break
+  }
+
+  const query = params.toString()
+  return query ? `?${query}` : ""
+}
+
 async function loadOrders(silent = false) {
   try {
     console.log("Fetching orders from:", CONFIG.API_BASE_URL)
     if (!silent) setLoadingState(true)
 
-    const response = await fetch(CONFIG.API_BASE_URL)
+    const response = await fetch(`${CONFIG.API_BASE_URL}${orderListQuery()}`)
     console.log("Orders response status:", response.status)
 
     if (!response.ok) {
@@ -755,7 +800,7 @@ function handleDateFilter(filterValue) {
     if (elements.endDate) elements.endDate.style.display = "none"
   }
 
-  applyFiltersAndRender()
+  loadOrders(true)
 }
 
 function switchTab(tabName) {
@@ -772,13 +817,38 @@ function switchTab(tabName) {
   applyFiltersAndRender()
 }
 
-function handleSearch(query) {
+async function handleSearch(query) {
   state.searchQuery = query.toLowerCase().trim()
+  state.searchResults = null
   state.currentPage = 1
   if (elements.clearSearch) {
     elements.clearSearch.style.display = query ? "block" : "none"
   }
   applyFiltersAndRender()
+
+  if (state.searchQuery) await searchOrdersOnServer(query.trim())
+}
+
+// Indexed search over every order (id, phone, name, customer id), not just
+// the ones loaded for the current filters. Late answers for an older query
+// are dropped; on failure the local filter stays in place.
+async function searchOrdersOnServer(query) {
+  const request = ++state.searchRequest
+  try {
+    const params = new URLSearchParams({ q: query, limit: 50 })
+    const response = await fetch(`${CONFIG.API_BASE_URL}/search?${params}`)
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`)
+    }
+
+    const results = await response.json()
+    if (request !== state.searchRequest) return
+
+    state.searchResults = results
+    applyFiltersAndRender()
+  } catch (error) {
+    console.error("Error searching orders:", error)
+  }
 }
 
 function handleSort(sortBy, sortOrder) {
@@ -824,6 +894,12 @@ function applyFiltersAndRender() {
         (order.customer_name && order.customer_name.toLowerCase().includes(state.searchQuery)) ||
         (order.phone_number && order.phone_number.toLowerCase().includes(state.searchQuery)),
     )
+
+    // server matches span all orders, so they skip the tab / date filters
+    if (state.searchResults) {
+      const shown = new Set(filtered.map((order) => order.id))
+      filtered = filtered.concat(state.searchResults.filter((order) => !shown.has(order.id)))
+    }
   }
 
   // Apply sorting with recent orders prioritized
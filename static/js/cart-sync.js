@@ -0,0 +1,14 @@
+// ============================================
+// CART SYNC - shared by the product pages
+// ============================================
+
+// Mirror a cart edit to the account cart (the cart page reads it back).
+// Guests get a 401 and stay local-only.
+function pushCartOp(op) {
+  fetch("/api/cart", {
+    method: "PATCH",
+    headers: { "Content-Type": "application/json" },
+    credentials: "include",
+    body: JSON.stringify({ ops: [op] }),
+  }).catch((error) => console.warn("Failed to sync cart change:", error))
+}
@@ -2,6 +2,9 @@
 // ============================================
 
 let cart = []
+let cartVersion = null
+let pricingQuote = null
+let pricingRequest = 0
 let userDetails = {}
 let selectedAddress = null
 let savedAddresses = []
@@ -104,25 +107,59 @@ async function loadSavedAddresses() {
   }
 }
 
+// Logged in -> the account cart is the source of truth (every page pushes
+// its edits). The guest cart is folded in once, at login; the merge here
+// only covers sessions that started before that existed. Not logged in ->
+// local only.
 async function fetchCartFromBackend() {
   try {
-    const response = await fetch("/cart", {
-      credentials: "include"
+    const mergePending = localStorage.getItem("cartMerged") !== "1"
+    const response = mergePending
+      ? await fetch("/api/cart/merge", {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          credentials: "include",
+          body: JSON.stringify({ items: cart }),
+        })
+      : await fetch("/api/cart", { credentials: "include" })
+    if (!response.ok) return
+
+    adoptServerCart(await response.json())
+    localStorage.setItem("cartMerged", "1")
+  } catch (error) {
+    console.error("Error fetching cart:", error)
+  }
+}
+
+function adoptServerCart(data) {
+  if (!data || !Array.isArray(data.items)) return
+  cart = data.items
+  cartVersion = data.version
+  localStorage.setItem("cart", JSON.stringify(cart))
+}
+
+// Send only the changed line; the server answers with the full cart
+// when our version was stale.
+async function pushCartChange(op) {
+  if (cartVersion === null) return
+  try {
+    const response = await fetch("/api/cart", {
+      method: "PATCH",
+      headers: { "Content-Type": "application/json" },
+      credentials: "include",
+      body: JSON.stringify({ base_version: cartVersion, ops: [op] }),
     })
-    
-    const contentType = response.headers.get("content-type")
-    if (!contentType || !contentType.includes("application/json")) {
-      console.warn("Cart endpoint returned non-JSON response, using localStorage")
-      return
-    }
+    if (!response.ok) return
 
     const data = await response.json()
-    if (Array.isArray(data)) {
-      cart = data
-      localStorage.setItem("cart", JSON.stringify(cart))
+    if (Array.isArray(data.items)) {
+      adoptServerCart(data)
+      renderCart()
+    } else {
+      cartVersion = data.version
     }
   } catch (error) {
-    console.error("Error fetching cart:", error)
+    console.warn("Failed to sync cart change:", error)
   }
 }
 
@@ -133,7 +170,9 @@ function calculatePricing() {
   // item.price is the FINAL selling price (what customer pays)
   // displayPrice = sellingPrice * 1.17 (to show as crossed out)
   // discount = displayPrice - sellingPrice
-  
+  // Amounts come from the server quote once it is in; the local sums are
+  // only shown until then.
+
   const subtotal = cart.reduce((sum, item) => {
     const sellingPrice = item.price // This is what customer pays
     const displayPrice = sellingPrice * 1.17 // This is what we show crossed out
@@ -151,12 +190,56 @@ function calculatePricing() {
     return sum + item.price * item.quantity
   }, 0)
 
+  if (pricingQuote) {
+    const { subtotal: paid, shipping, total } = pricingQuote
+    const listed = paid * 1.17
+    return { subtotal: listed, discount: listed - paid, total, shipping, actualTotal: paid }
+  }
+
   const shipping = actualTotal > FREE_DELIVERY_THRESHOLD ? 0 : DELIVERY_CHARGE
   const total = actualTotal + shipping
 
   return { subtotal, discount, total, shipping, actualTotal }
 }
 
+// Current prices + shipping/total for the whole cart, from the same index
+// /create-order/ charges with. Stale answers (cart changed meanwhile) are
+// dropped.
+async function refreshPricing() {
+  const request = ++pricingRequest
+  if (cart.length === 0) return
+
+  try {
+    const response = await fetch("/api/cart/price", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        items: cart.map(({ id, variant, quantity }) => ({ id, variant, quantity })),
+      }),
+    })
+    if (!response.ok || request !== pricingRequest) return
+
+    const quote = await response.json()
+    if (request !== pricingRequest) return
+
+    cart.forEach((item) => {
+      const line = quote.items.find(
+        (l) => l.id === item.id && (!item.variant || l.variant === item.variant),
+      )
+      if (line) item.price = line.price
+    })
+    if (quote.unavailable.length) {
+      showToast("Some items in your cart are no longer available", "warning")
+    }
+
+    pricingQuote = quote
+    renderCartItems()
+    updateAllPricing()
+  } catch (error) {
+    console.warn("Failed to price cart:", error)
+  }
+}
+
 function updateAllPricing() {
   const { subtotal, discount, total, shipping } = calculatePricing()
 
@@ -198,7 +281,9 @@ function renderCart() {
     renderSelectedAddress()
   }
 
+  pricingQuote = null
   updateAllPricing()
+  refreshPricing()
 }
 
 function showEmptyCart() {
@@ -313,6 +398,7 @@ async function updateQuantity(productId, change) {
 
     if (itemIndex !== -1) {
       cart[itemIndex].quantity += change
+      pushCartChange({ op: "set", ...cart[itemIndex] })
 
       if (cart[itemIndex].quantity <= 0) {
         cart.splice(itemIndex, 1)
@@ -385,12 +471,45 @@ function setupMinDeliveryDate() {
     dateInput.value = saved
     document.getElementById('dateStatus').textContent = new Date(saved).toLocaleDateString()
   }
+
+  loadDeliverySlots()
+}
+
+// dates the kitchen can still take this cart (server capacity index)
+let deliverySlots = {}
+
+async function loadDeliverySlots() {
+  const dateInput = document.getElementById('deliveryDate')
+  if (!dateInput || !cart.length) return
+
+  try {
+    const response = await fetch("/api/delivery-slots", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        items: cart.map(item => ({ id: item.id, variant: item.variant, quantity: item.quantity })),
+      }),
+    })
+    if (!response.ok) return
+
+    const data = await response.json()
+    deliverySlots = Object.fromEntries(data.slots.map(slot => [slot.date, slot.available]))
+    dateInput.min = data.earliest
+  } catch (error) {
+    console.error("Delivery slots error:", error)
+  }
 }
 
 function updateDeliveryDate() {
   const dateInput = document.getElementById('deliveryDate')
   const date = dateInput.value
-  
+
+  if (date && deliverySlots[date] === false) {
+    showToast('This date is fully booked, please pick another day', 'error')
+    dateInput.value = ''
+    return
+  }
+
   if (date) {
     localStorage.setItem('selectedDeliveryDate', date)
     document.getElementById('dateStatus').textContent = new Date(date).toLocaleDateString()
@@ -543,8 +662,8 @@ async function addNewAddress() {
     return
   }
 
+  // id is assigned by the server
   const newAddress = {
-    id: Date.now(),
     line1,
     line2,
     city,
@@ -565,8 +684,9 @@ async function addNewAddress() {
     })
 
     if (response.ok) {
-      savedAddresses.push(newAddress)
-      selectedAddress = newAddress
+      const data = await response.json()
+      savedAddresses.push(data.address)
+      selectedAddress = data.address
       localStorage.setItem("selectedAddressId", selectedAddress.id)
 
       showToast("Address added successfully", "success")
@@ -574,7 +694,7 @@ async function addNewAddress() {
       renderSelectedAddress()
     } else {
       const error = await response.json().catch(() => ({}))
-      showToast(error.detail || "Failed to save address", "error")
+      showToast(error.message || error.detail || "Failed to save address", "error")
     }
   } catch (error) {
     console.error("Error saving address:", error)
@@ -650,6 +770,7 @@ async function proceedToCheckout() {
   }
 
   const deliveryDate = document.getElementById("deliveryDate")?.value || localStorage.getItem("selectedDeliveryDate")
+  // the server reprices the cart; this is only the amount we showed
   const { total } = calculatePricing()
 
   try {
@@ -677,7 +798,7 @@ async function proceedToCheckout() {
 
     const options = {
       key: data.key,
-      amount: Math.round(total * 100),
+      amount: Math.round(data.amount * 100), // what /create-order/ charged, in paise
       currency: "INR",
       name: "Gokhale Bandhu",
       description: "Order Payment",
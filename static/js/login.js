@@ -47,6 +47,8 @@ loginForm.addEventListener("submit", async (e) => {
       localStorage.setItem("user", JSON.stringify(result.user))
     }
 
+    await mergeGuestCart()
+
     showSuccess(result.message || "Login successful! Redirecting...")
 
     setTimeout(() => {
@@ -123,6 +125,27 @@ function validateLoginInputs(mobile, password) {
   return isValid
 }
 
+// Fold the guest cart into the account cart once, right after login;
+// from here on every page pushes its edits and the server cart wins.
+async function mergeGuestCart() {
+  try {
+    const guestCart = JSON.parse(localStorage.getItem("cart")) || []
+    const response = await fetch("/api/cart/merge", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      credentials: "include",
+      body: JSON.stringify({ items: guestCart }),
+    })
+    if (!response.ok) return
+
+    const data = await response.json()
+    localStorage.setItem("cart", JSON.stringify(data.items || []))
+    localStorage.setItem("cartMerged", "1")
+  } catch (error) {
+    console.warn("Failed to merge guest cart:", error)
+  }
+}
+
 // ============================================
 // FORGOT PASSWORD - STEP 1: VERIFY
 // ============================================
@@ -407,6 +407,10 @@ async function addToCartFromRelated(productId) {
     }
 
     localStorage.setItem("cart", JSON.stringify(cart));
+    pushCartOp({
+      op: "set",
+      ...cart.find((item) => item.id === Number(productId) && item.variant === finalVariant),
+    });
 
     // Safe calls with error handling
     try { updateCartCount?.(); } catch (err) { }
@@ -583,6 +587,7 @@ async function addToCart(productId, quantity = 1, variantInfo = null) {
 
     // ✅ THIS is the success moment
     localStorage.setItem("cart", JSON.stringify(cart))
+    pushCartOp({ op: "set", ...cart[index !== -1 ? index : cart.length - 1] })
 
     // ✅ UI updates must NEVER break logic
     try { updateCartCount?.() } catch { }
@@ -717,6 +722,7 @@ function updateCartItemQuantity(productId, variant, change) {
 
   if (itemIndex !== -1) {
     cart[itemIndex].quantity += change
+    pushCartOp({ op: "set", ...cart[itemIndex] })
     if (cart[itemIndex].quantity <= 0) {
       cart.splice(itemIndex, 1)
     }
@@ -739,6 +745,7 @@ function removeFromCart(productId, variant) {
     cart.splice(itemIndex, 1)
 
     localStorage.setItem("cart", JSON.stringify(cart))
+    pushCartOp({ op: "remove", id: removedItem.id, variant: removedItem.variant })
     updateCartCount()
     syncCartCounts()
     updateCartDisplay()
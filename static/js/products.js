@@ -1013,6 +1013,10 @@ async function addToCart(productId) {
     }
 
     localStorage.setItem("cart", JSON.stringify(cart))
+    pushCartOp({
+      op: "set",
+      ...cart.find((item) => item.id === Number.parseInt(productId) && item.variant === finalVariant),
+    })
 
     updateCartCount()
     syncCartCounts()
@@ -1313,6 +1317,7 @@ function updateCartQuantity(productId, variant, change) {
 
     if (itemIndex !== -1) {
       cart[itemIndex].quantity += change
+      pushCartOp({ op: "set", ...cart[itemIndex] })
 
       if (cart[itemIndex].quantity <= 0) {
         cart.splice(itemIndex, 1)
@@ -1335,6 +1340,7 @@ function removeFromCart(productId, variant) {
     const filteredCart = cart.filter((item) => !(item.id === productId && item.variant === variant))
 
     localStorage.setItem("cart", JSON.stringify(filteredCart))
+    pushCartOp({ op: "remove", id: productId, variant })
     updateCartCount()
     syncCartCounts()
     updateCartDisplay()
@@ -1652,7 +1658,7 @@ async function addAddressAndContinue() {
   const newAddress = {
     id: userDetails.id,
     address: {
-      id: Date.now(), // or use a better unique generator if needed
+      // id is assigned by the server
       line1,
       line2,
       city,
@@ -1674,7 +1680,7 @@ async function addAddressAndContinue() {
 
     if (response.ok) {
       const data = await response.json()
-      const savedAddress = data.addresses?.slice(-1)[0] // get the last added address
+      const savedAddress = data.address
       savedAddresses.push(savedAddress)
       selectedAddress = savedAddress
       localStorage.setItem("selectedAddressId", selectedAddress.id)
@@ -1779,7 +1785,7 @@ async function initiatePayment() {
     // Initialize Razorpay
     const options = {
       key: razorpay_key,
-      amount: finalAmount * 100, // convert to paise
+      amount: Math.round(orderData.amount * 100), // server-priced total, in paise
       currency: "INR",
       name: "Gokhale Bandu",
       description: "Order Payment",
@@ -0,0 +1,101 @@
+"""
+Order housekeeping jobs against the local gateway stub (no network) and an
+in-memory SQLite copy of the schema.
+
+    python -m pytest -q
+"""
+import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database.session import Base  # noqa: E402
+from app.models.capacity import DeliveryCapacity  # noqa: E402
+from app.models.orders import Order  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models import address, admin, cart, kitchenPrep, product  # noqa: E402,F401
+from app.services.gateway_stub import StubRazorpayClient  # noqa: E402
+from app.services.order_jobs import expire_pending_orders, reconcile_pending_orders  # noqa: E402
+
+DELIVERY_DATE = datetime.date.today() + datetime.timedelta(days=3)
+ITEMS = [{"id": 1, "name": "Besan Ladoo", "variant": "500gm", "quantity": 2, "price": 380}]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, first_name="Asha", email="asha@example.com", mobile_number="9876543210"))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def add_order(db, minutes_ago, status="pending", razorpay_order_id=None):
+    order = Order(
+        user_id=1,
+        first_name="Asha",
+        mobile_number="9876543210",
+        delivery_date=DELIVERY_DATE,
+        address={"line1": "1 MG Rd", "city": "Pune"},
+        items=ITEMS,
+        total_amount=760,
+        order_status=status,
+        razorpay_order_id=razorpay_order_id,
+        created_at=datetime.datetime.utcnow() - datetime.timedelta(minutes=minutes_ago),
+    )
+    db.add(order)
+    db.commit()
+    return order
+
+
+def test_reconcile_places_paid_order_without_webhook(db):
+    client = StubRazorpayClient()
+    paid = add_order(db, 10, razorpay_order_id=client.order.create({"amount": 76000})["id"])
+    unpaid = add_order(db, 10, razorpay_order_id=client.order.create({"amount": 76000})["id"])
+    # the customer pays, but the tab closes before /verify-payment/ and no webhook arrives
+    payment_id = client.capture(paid.razorpay_order_id)["payment_id"]
+
+    result = reconcile_pending_orders(db, window_minutes=30, client=client)
+
+    assert result == {"checked": 2, "placed": 1}
+    db.refresh(paid)
+    db.refresh(unpaid)
+    assert paid.order_status == "placed"
+    assert paid.razorpay_payment_id == payment_id
+    assert unpaid.order_status == "pending"
+
+    capacity = db.get(DeliveryCapacity, DELIVERY_DATE)
+    assert (capacity.booked_grams, capacity.booked_pieces) == (1000, 0)
+
+
+def test_reconcile_leaves_checkouts_in_progress_alone(db):
+    client = StubRazorpayClient()
+    order = add_order(db, 0, razorpay_order_id=client.order.create({"amount": 76000})["id"])
+    client.capture(order.razorpay_order_id)
+
+    assert reconcile_pending_orders(db, window_minutes=30, client=client) == {"checked": 0, "placed": 0}
+    db.refresh(order)
+    assert order.order_status == "pending"
+    assert db.get(DeliveryCapacity, DELIVERY_DATE) is None
+
+
+def test_expire_only_touches_old_pending_orders(db):
+    old = add_order(db, 120)
+    fresh = add_order(db, 5)
+    placed = add_order(db, 120, status="placed")
+
+    assert expire_pending_orders(db, ttl_minutes=60) == {"expired": 1}
+    for order in (old, fresh, placed):
+        db.refresh(order)
+    assert old.order_status == "expired"
+    assert old.updated_at is not None
+    assert fresh.order_status == "pending"
+    assert placed.order_status == "placed"